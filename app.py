@@ -22,10 +22,12 @@ from src.domain.downloads import (
     AudioCoverDownloadService,
     FileManager,
 )
-from src.domain.catalog import MetadataService, LyricsService
+from src.domain.catalog import MetadataService, LyricsService, open_lyrics_cache
 from src.domain.burning import CDBurningService, BurnSessionManager
 from src.support.app_settings import apply_api_keys, apply_download_settings, get_api_keys, get_download_settings
 from src.infrastructure.spotdl import build_default_client
+from src.infrastructure.spotify import prefetch_spotify_token
+from src.interfaces.http.responses import OrjsonJSONProvider
 from src.interfaces.http.routes import (
     download_bp,
     artist_bp,
@@ -102,6 +104,8 @@ def configure_logging(log_dir: str) -> str:
 
 def create_app():
     app = Flask(__name__, static_folder='frontend/build', static_url_path='') # Assuming frontend/build now for static files
+    # jsonify() encodes through orjson when it is installed
+    app.json = OrjsonJSONProvider(app)
     app.config.from_object(Config)
     runtime_api_keys = get_api_keys(app)
     apply_api_keys(app, runtime_api_keys)
@@ -175,7 +179,10 @@ def create_app():
         spotdl_audio_source=app.config.get('SPOTDL_AUDIO_SOURCE'),
         spotdl_format=app.config.get('SPOTDL_FORMAT'),
     )
-    lyrics_service = LyricsService(genius_access_token=app.config.get('GENIUS_ACCESS_TOKEN'))
+    lyrics_service = LyricsService(
+        genius_access_token=app.config.get('GENIUS_ACCESS_TOKEN'),
+        remote_cache=open_lyrics_cache(),
+    )
     file_manager = FileManager(base_output_dir=app.config.get('BASE_OUTPUT_DIR'))
     download_repository = DefaultDownloadRepository()
 
@@ -198,6 +205,8 @@ def create_app():
 
     # Expose orchestrator for routes
     app.extensions['download_orchestrator'] = download_orchestrator
+    if download_orchestrator.sp is not None:
+        prefetch_spotify_token(download_orchestrator.sp)
 
     # Initialize job queue orchestrator
     try:
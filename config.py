@@ -38,6 +38,16 @@ class Config:
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or \
         'sqlite:///' + os.path.join(basedir, 'src', 'database', 'instance', 'beathub.db')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Request threads and download jobs share this pool; pre-ping replaces
+    # connections the server dropped instead of failing a request. The sizing
+    # keys are dropped for in-memory SQLite (see initialize_database).
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_size': max(1, _get_int('DB_POOL_SIZE', 10)),
+        'max_overflow': max(0, _get_int('DB_MAX_OVERFLOW', 20)),
+        'pool_timeout': max(1, _get_int('DB_POOL_TIMEOUT', 10)),
+        'pool_recycle': _get_int('DB_POOL_RECYCLE', 1800),
+        'pool_pre_ping': True,
+    }
 
     # Spotify API
     SPOTIPY_CLIENT_ID = os.environ.get('SPOTIPY_CLIENT_ID')
@@ -60,10 +70,35 @@ class Config:
     # Download orchestration
     DOWNLOAD_QUEUE_WORKERS = _get_int('DOWNLOAD_QUEUE_WORKERS', 2)
     DOWNLOAD_MAX_RETRIES = _get_int('DOWNLOAD_MAX_RETRIES', 2)
+    # nginx internal location mapped to BASE_OUTPUT_DIR (e.g. /protected_audio/). When
+    # set, audio is handed to nginx via X-Accel-Redirect instead of streamed by Flask.
+    AUDIO_X_ACCEL_PREFIX = os.getenv('AUDIO_X_ACCEL_PREFIX', '').strip()
+    # Concurrent lyrics lookups (embedded export + remote fallbacks) per download
+    LYRICS_EXPORT_WORKERS = max(1, _get_int('LYRICS_EXPORT_WORKERS', 8))
+    # Remember remote lyrics lookups (including misses) per title/artist (empty path disables)
+    LYRICS_CACHE_DB_PATH = os.getenv(
+        'LYRICS_CACHE_DB_PATH',
+        os.path.join(basedir, 'src', 'database', 'instance', 'lyrics_cache.sqlite'),
+    )
+    LYRICS_CACHE_TTL_SECONDS = _get_int('LYRICS_CACHE_TTL_SECONDS', 30 * 24 * 3600)
+    LYRICS_CACHE_MISS_TTL_SECONDS = _get_int('LYRICS_CACHE_MISS_TTL_SECONDS', 24 * 3600)
+
+    # Keep-alive connections kept per host by the shared HTTP sessions. Sized for
+    # the concurrent Spotify page fetches and lyrics workers; connections past
+    # this are closed after each request instead of being reused.
+    HTTP_POOL_MAXSIZE = max(1, _get_int('HTTP_POOL_MAXSIZE', 32))
 
     # Metadata caching (Spotify/SpotDL lookups)
     METADATA_CACHE_TTL_SECONDS = _get_int('METADATA_CACHE_TTL_SECONDS', 300)
     METADATA_CACHE_MAXSIZE = max(1, _get_int('METADATA_CACHE_MAXSIZE', 256))
+    # Bounds for the adaptive per-kind TTL (album/track/playlist) on top of the base TTL
+    METADATA_CACHE_MIN_TTL_SECONDS = max(1, _get_int('METADATA_CACHE_MIN_TTL_SECONDS', 60))
+    METADATA_CACHE_MAX_TTL_SECONDS = max(1, _get_int('METADATA_CACHE_MAX_TTL_SECONDS', 30 * 24 * 3600))
+    # Persist Spotify metadata lookups to SQLite so restarts start warm (empty path disables)
+    METADATA_CACHE_DB_PATH = os.getenv(
+        'METADATA_CACHE_DB_PATH',
+        os.path.join(basedir, 'src', 'database', 'instance', 'metadata_cache.sqlite'),
+    )
 
     # Popular artists sourcing (fully controlled by app)
     # Curated editorial/viral playlists used to seed the pool. Not configurable via env.
@@ -1,5 +1,5 @@
 """Core primitives shared across backend layers."""
 
-from .progress import ProgressBroker, ProgressPublisher, BrokerPublisher
+from .progress import ProgressBroker, ProgressPublisher, BrokerPublisher, JobPublisher, heartbeat_frame, sse_frame
 
-__all__ = ["ProgressBroker", "ProgressPublisher", "BrokerPublisher"]
+__all__ = ["ProgressBroker", "ProgressPublisher", "BrokerPublisher", "JobPublisher", "heartbeat_frame", "sse_frame"]
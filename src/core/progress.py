@@ -11,44 +11,120 @@ from __future__ import annotations
 import json
 import threading
 import time
-from queue import Queue, Empty
-from typing import Dict, Iterator
+from collections import deque
+from queue import Empty
+from typing import Deque, Dict, Iterator, Optional, Tuple
+
+try:  # optional: C-backed encoder for high-frequency progress events
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore
+
+
+def sse_frame(event: dict) -> bytes:
+    """Encode ``event`` as a ready-to-send SSE ``data:`` frame."""
+    payload = None
+    if orjson is not None:
+        try:
+            payload = orjson.dumps(event, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            payload = None
+    if payload is None:
+        payload = json.dumps(event, ensure_ascii=False, default=str).encode('utf-8')
+    return b"data: " + payload + b"\n\n"
+
+
+def heartbeat_frame(now: float) -> bytes:
+    return b'event: heartbeat\ndata: {"ts": %d }\n\n' % int(now)
+
+
+class EventBuffer:
+    """Per-subscriber buffer of ``(event, frame)`` pairs with a single reader.
+
+    Publishers append to a deque, which is atomic, and set an Event, so they
+    never contend on a queue lock. With ``maxlen`` the oldest entries are
+    dropped once the reader falls behind.
+    """
+
+    def __init__(self, maxlen: Optional[int] = None) -> None:
+        self._items: Deque[Tuple[dict, bytes]] = deque(maxlen=maxlen or None)
+        self._ready = threading.Event()
+
+    def put(self, item: Tuple[dict, bytes]) -> None:
+        self._items.append(item)
+        self._ready.set()
+
+    def get(self, timeout: float) -> Tuple[dict, bytes]:
+        """Return the oldest pair, waiting up to ``timeout`` seconds; raises ``queue.Empty``."""
+        while True:
+            try:
+                return self._items.popleft()
+            except IndexError:
+                pass
+            self._ready.clear()
+            # An append may have landed between the popleft and the clear
+            if self._items:
+                continue
+            if not self._ready.wait(timeout):
+                raise Empty
 
 
 class ProgressBroker:
     def __init__(self) -> None:
         self._lock = threading.RLock()
-        self._subscribers: Dict[int, Queue] = {}
+        self._subscribers: Dict[int, EventBuffer] = {}
         self._next_id = 1
 
     def publish(self, event: dict) -> None:
+        # Snapshot under the lock and fan out without it so a burst of progress
+        # events does not hold up subscribe/unsubscribe from the SSE handlers.
         with self._lock:
-            for q in self._subscribers.values():
-                q.put(event)
+            buffers = list(self._subscribers.values())
+        if not buffers:
+            return
+        # Encoded once here and shared by every subscriber
+        item = (event, sse_frame(event))
+        for buf in buffers:
+            buf.put(item)
+
+    def has_subscribers(self) -> bool:
+        """Whether anyone is listening; lets callers skip building unobserved events."""
+        return bool(self._subscribers)
+
+    def open_queue(self, maxsize: int = 0) -> Tuple[int, EventBuffer]:
+        """Register an event buffer and return ``(subscription_id, buffer)``.
 
-    def subscribe(self, heartbeat_seconds: int = 15) -> Iterator[str]:
-        """Return an iterator yielding SSE-formatted lines."""
+        The buffer yields ``(event, sse_frame)`` pairs. With ``maxsize`` it keeps
+        only the newest events when its reader is slow. Pair with :meth:`close_queue`.
+        """
         with self._lock:
             sid = self._next_id
             self._next_id += 1
-            q: Queue = Queue()
-            self._subscribers[sid] = q
+            buf = EventBuffer(maxlen=maxsize)
+            self._subscribers[sid] = buf
+        return sid, buf
+
+    def close_queue(self, sid: int) -> None:
+        with self._lock:
+            self._subscribers.pop(sid, None)
+
+    def subscribe(self, heartbeat_seconds: int = 15) -> Iterator[bytes]:
+        """Return an iterator yielding SSE-formatted frames as bytes."""
+        sid, buf = self.open_queue()
 
         last_beat = time.time()
         try:
             while True:
                 try:
-                    ev = q.get(timeout=1.0)
-                    payload = json.dumps(ev, ensure_ascii=False)
-                    yield f"data: {payload}\n\n"
+                    _, frame = buf.get(timeout=1.0)
+                    yield frame
                 except Empty:
                     now = time.time()
                     if now - last_beat >= heartbeat_seconds:
                         last_beat = now
-                        yield "event: heartbeat\n" + f"data: {{\"ts\": {int(now)} }}\n\n"
+                        yield heartbeat_frame(now)
         finally:
-            with self._lock:
-                self._subscribers.pop(sid, None)
+            self.close_queue(sid)
 
 
 class ProgressPublisher:
@@ -64,4 +140,23 @@ class BrokerPublisher(ProgressPublisher):
         self._broker.publish(event)
 
 
-__all__ = ["ProgressBroker", "ProgressPublisher", "BrokerPublisher"]
+class JobPublisher(ProgressPublisher):
+    """Stamps each event with ``job_id`` so per-job streams can pick theirs out of the broker."""
+
+    def __init__(self, inner: ProgressPublisher, job_id: str) -> None:
+        self._inner = inner
+        self._job_id = job_id
+
+    def publish(self, event: dict) -> None:
+        self._inner.publish({**event, 'job_id': self._job_id})
+
+
+__all__ = [
+    "EventBuffer",
+    "ProgressBroker",
+    "ProgressPublisher",
+    "BrokerPublisher",
+    "JobPublisher",
+    "heartbeat_frame",
+    "sse_frame",
+]
@@ -5,7 +5,7 @@ from werkzeug.security import check_password_hash, generate_password_hash
 import os  # Import os for path handling
 import logging
 from datetime import datetime
-from sqlalchemy import ForeignKey, UniqueConstraint, CheckConstraint
+from sqlalchemy import ForeignKey, UniqueConstraint, CheckConstraint, Index
 from sqlalchemy.orm import relationship
 try:
     # SQLAlchemy 2.x
@@ -96,6 +96,11 @@ class DownloadedItem(db.Model):
 
     owner = relationship('User', back_populates='downloads')
 
+    __table_args__ = (
+        # Serves the per-user library listing ordered by title
+        Index('ix_downloaded_items_user_title', 'user_id', 'title'),
+    )
+
     def __repr__(self):
         # Improved representation for debugging
         return f'<DownloadedItem {self.item_type.capitalize()}: {self.title} by {self.artist}>'
@@ -265,7 +270,11 @@ class PlaylistTrack(db.Model):
     )
 
     def to_dict(self) -> dict:
-        source = self.track_snapshot or (self.track.to_dict() if self.track else {})
+        # The snapshot taken when the entry was added is returned as stored;
+        # only legacy rows without one fall back to serializing the track
+        source = self.track_snapshot
+        if source is None:
+            source = self.track.to_dict() if self.track else {}
         return {
             'id': self.id,
             'playlist_id': self.playlist_id,
@@ -401,11 +410,30 @@ def get_system_user_id() -> int:
     return system.id
 
 
+# QueuePool sizing options; StaticPool (in-memory SQLite) rejects them
+_QUEUE_POOL_OPTIONS = ('pool_size', 'max_overflow', 'pool_timeout')
+
+
+def _engine_options_for(uri, options):
+    """Drop the QueuePool sizing keys when Flask-SQLAlchemy will use a StaticPool."""
+    if not uri:
+        return options
+    url = make_url(uri)
+    # Same test Flask-SQLAlchemy uses to pick StaticPool for in-memory SQLite
+    if url.drivername.startswith('sqlite') and url.database in (None, '', ':memory:'):
+        return {k: v for k, v in options.items() if k not in _QUEUE_POOL_OPTIONS}
+    return options
+
+
 def initialize_database(app):
     """
     Initializes the SQLAlchemy extension with the Flask app instance
     and creates all database tables if they don't already exist.
     """
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = _engine_options_for(
+        app.config.get('SQLALCHEMY_DATABASE_URI'),
+        app.config.get('SQLALCHEMY_ENGINE_OPTIONS') or {},
+    )
     db.init_app(app)
     # Ensure the instance folder exists for SQLite database file
     instance_path = app.instance_path
@@ -431,6 +459,9 @@ def initialize_database(app):
     # Create database tables within the application context
     with app.app_context():
         db.create_all()
+        # create_all skips indexes on tables that already exist
+        for index in DownloadedItem.__table__.indexes:
+            index.create(db.engine, checkfirst=True)
         logger.info("Database tables created or already exist.")
         ensure_system_user()
 
@@ -313,7 +313,7 @@ class CDBurningService:
         if not os.path.exists(metadata_path):
             raise FileNotFoundError(f"spotify_metadata.json not found in {content_dir}")
 
-        self.logger.info(f"Parsing spotify_metadata.json from {metadata_path}")
+        self.logger.info("Parsing spotify_metadata.json from %s", metadata_path)
         with open(metadata_path, 'r', encoding='utf-8') as f:
             metadata = json.load(f)
 
@@ -394,7 +394,7 @@ class CDBurningService:
         if any(t.get('track_number') is not None or t.get('disc_number') is not None for t in tracks_data):
             tracks_data.sort(key=_key)
 
-        self.logger.info(f"Found {len(tracks_data)} tracks in metadata.")
+        self.logger.info("Found %s tracks in metadata.", len(tracks_data))
         return tracks_data
 
     def generate_burn_plan(self, content_dir: str, disc_title: Optional[str] = None) -> dict:
@@ -677,7 +677,7 @@ class CDBurningService:
         Ensures 44.1 kHz, 16-bit, stereo for audio CD compatibility.
         Returns a list of paths to the converted WAV files, in the correct order.
         """
-        self.logger.info(f"Starting MP3 to WAV conversion for {len(tracks_data)} tracks in {content_dir}...")
+        self.logger.info("Starting MP3 to WAV conversion for %s tracks in %s...", len(tracks_data), content_dir)
         wav_file_paths = []
         total_tracks = len(tracks_data)
 
@@ -777,14 +777,14 @@ class CDBurningService:
             wav_output_path = os.path.join(temp_wav_dir, f"{i+1:02d}_{sanitized_title}.wav")
 
             try:
-                self.logger.info(f"Converting '{os.path.basename(found_mp3_path)}' to WAV...")
+                self.logger.info("Converting '%s' to WAV...", os.path.basename(found_mp3_path))
                 t0 = time.perf_counter()
                 audio = AudioSegment.from_mp3(found_mp3_path)
                 # Ensure 44.1 kHz, 16-bit, stereo for audio CD compatibility
                 audio = audio.set_frame_rate(44100).set_channels(2).set_sample_width(2)
                 audio.export(wav_output_path, format="wav")
                 elapsed = time.perf_counter() - t0
-                self.logger.info(f"Converted track {i+1}/{total_tracks} in {elapsed:.2f}s: {os.path.basename(wav_output_path)}")
+                self.logger.info("Converted track %s/%s in %.2fs: %s", i + 1, total_tracks, elapsed, os.path.basename(wav_output_path))
                 wav_file_paths.append(wav_output_path)
                 try:
                     session.log_event('track_converted', index=i+1, total=total_tracks, source_path=found_mp3_path, wav_path=wav_output_path, elapsed_sec=round(elapsed, 2))
@@ -809,7 +809,7 @@ class CDBurningService:
                     except Exception:
                         pass
             except Exception as e:
-                self.logger.exception(f"Error converting MP3 '{found_mp3_path}' to WAV: {e}")
+                self.logger.exception("Error converting MP3 '%s' to WAV: %s", found_mp3_path, e)
                 try:
                     session.log_event('track_convert_error', index=i+1, source_path=found_mp3_path, title=track.get('title'), artist=track.get('artist'), error=str(e))
                 except Exception:
@@ -817,7 +817,7 @@ class CDBurningService:
                 raise RuntimeError(f"Failed to convert '{track['title']}' to WAV: {e}")
 
         total_elapsed = time.perf_counter() - conv_start
-        self.logger.info(f"Finished converting {len(wav_file_paths)} tracks to WAV in {total_elapsed:.2f}s.")
+        self.logger.info("Finished converting %s tracks to WAV in %.2fs.", len(wav_file_paths), total_elapsed)
         try:
             session.log_event('conversion_complete', track_count=len(wav_file_paths), elapsed_sec=round(total_elapsed, 2))
         except Exception:
@@ -919,9 +919,9 @@ class CDBurningService:
         if os.path.exists(temp_dir):
             try:
                 shutil.rmtree(temp_dir)
-                self.logger.info(f"Cleaned up temporary directory: {temp_dir}")
+                self.logger.info("Cleaned up temporary directory: %s", temp_dir)
             except OSError as e:
-                self.logger.error(f"Error removing temporary directory {temp_dir}: {e}")
+                self.logger.error("Error removing temporary directory %s: %s", temp_dir, e)
 
     def burn_cd(self, content_dir, item_title, *, session: BurnSession, publisher: Optional[ProgressPublisher] = None):
         """
@@ -934,7 +934,7 @@ class CDBurningService:
         self._cancel_flags[session.id] = cancel_event
         self._active_session_id = session.id
         try:
-            self.logger.info(f"Starting CD burn process for content from: {content_dir}")
+            self.logger.info("Starting CD burn process for content from: %s", content_dir)
             session.start(status=f"Preparing to burn '{item_title}'...", progress=0)
             try:
                 session.log_event('burn_session_info', content_dir=content_dir, item_title=item_title)
@@ -976,7 +976,7 @@ class CDBurningService:
 
             # 2. Parse Spotify metadata to get track order and details
             tracks_data = self._parse_spotify_metadata(content_dir)
-            self.logger.info(f"Successfully parsed {len(tracks_data)} tracks from metadata.")
+            self.logger.info("Successfully parsed %s tracks from metadata.", len(tracks_data))
             if publisher is not None:
                 try:
                     publisher.publish({
@@ -992,7 +992,7 @@ class CDBurningService:
 
             # 3. Create a temporary directory for converted WAV files
             temp_wav_dir = tempfile.mkdtemp(prefix='cd_burn_wavs_')
-            self.logger.info(f"Created temporary WAV directory: {temp_wav_dir}")
+            self.logger.info("Created temporary WAV directory: %s", temp_wav_dir)
 
             # 4. Convert MP3s to WAVs suitable for audio CD
             session.update_status("Converting MP3s to WAVs...", progress=5)
@@ -1027,11 +1027,11 @@ class CDBurningService:
             )
 
             session.complete()
-            self.logger.info(f"CD burn for '{item_title}' completed successfully.")
+            self.logger.info("CD burn for '%s' completed successfully.", item_title)
 
         except (FileNotFoundError, ValueError, RuntimeError) as e:
             # Catch specific errors from internal methods
-            self.logger.error(f"CD burning process failed due to: {e}")
+            self.logger.error("CD burning process failed due to: %s", e)
             # Extract HRESULT-like code if present
             err_msg = str(e)
             code = None
@@ -1,6 +1,6 @@
 """Catalog domain services (metadata, lyrics)."""
 
 from .metadata_service import MetadataService
-from .lyrics_service import LyricsService
+from .lyrics_service import LyricsService, open_lyrics_cache
 
-__all__ = ["MetadataService", "LyricsService"]
+__all__ = ["MetadataService", "LyricsService", "open_lyrics_cache"]
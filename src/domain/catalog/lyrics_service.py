@@ -1,15 +1,18 @@
+import hashlib
 import logging
 import os
-import re
-from typing import Iterable, Optional
-
-import requests
-from bs4 import BeautifulSoup
+from functools import lru_cache
+from typing import Iterable, Optional, Tuple
 
 from config import Config
+from src.infrastructure.http import get_shared_session
+from src.utils.filenames import sanitize_filename
+from src.utils.cache import MISSING
+from src.utils.persistent_cache import SQLiteCache
 
 logger = logging.getLogger(__name__)
 
+
 try:
     # Prefer importing mutagen lazily in call sites, but keep top-level available if installed
     from mutagen import File as MutagenFile  # type: ignore
@@ -22,31 +25,65 @@ except Exception:  # pragma: no cover - mutagen is in requirements; defensive im
     MutagenFile = None  # type: ignore
     ID3 = USLT = MP3 = MP4 = FLAC = OggVorbis = None  # type: ignore
 
-try:
-    import syncedlyrics
-except Exception:  # pragma: no cover - optional dependency failures shouldn't break pipeline
-    syncedlyrics = None  # type: ignore
+@lru_cache(maxsize=None)
+def _load_syncedlyrics():
+    """Import syncedlyrics on first use; its provider stack is slow to load."""
+    try:
+        import syncedlyrics
+    except Exception:  # pragma: no cover - optional dependency failures shouldn't break pipeline
+        return None
+    return syncedlyrics
+
+
+def _write_text(path: str, text: str) -> None:
+    """Write ``text`` as UTF-8 with raw fd writes, skipping the TextIOWrapper layer."""
+    data = memoryview(text.encode("utf-8"))
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o644)
+    try:
+        while data:
+            written = os.write(fd, data)
+            data = data[written:]
+    finally:
+        os.close(fd)
+
+
+# Stored for lookups that found nothing, so repeat misses skip the network
+_LYRICS_MISS = ""
+
+
+def open_lyrics_cache() -> Optional[SQLiteCache]:
+    """Open the on-disk lyrics memo, or return None when it is disabled or unavailable."""
+    if not Config.LYRICS_CACHE_DB_PATH:
+        return None
+    try:
+        return SQLiteCache(Config.LYRICS_CACHE_DB_PATH, ttl=Config.LYRICS_CACHE_TTL_SECONDS)
+    except Exception as exc:
+        logger.warning("Lyrics cache unavailable; remote lookups will not be memoised: %s", exc)
+        return None
 
 
 class LyricsService:
-    def __init__(self, genius_access_token=None):
+    def __init__(self, genius_access_token=None, remote_cache: Optional[SQLiteCache] = None):
         """Lyrics utilities for the SpotDL pipeline.
 
         Note: External lyrics fetching via Genius API is removed. SpotDL can
         embed lyrics using its own providers (optionally using a Genius token)
         during download; this service focuses on extracting and exporting
         embedded lyrics from audio files.
+
+        ``remote_cache`` memoises remote lookups; pass the same instance when
+        the service is rebuilt so the memo survives key changes.
         """
         # Keep compatibility for callers that passed a token; handled by SpotDL
         # at download time via settings. This class does not use the token.
         _ = genius_access_token or Config.GENIUS_ACCESS_TOKEN
+        # Genius search + page fetches reuse pooled keep-alive connections
+        self._http = get_shared_session()
+        self.remote_cache = remote_cache
 
     def _sanitize_filename(self, name):
         """Sanitizes a string to be used as a filename."""
-        name = re.sub(r'[\\/:*?"<>|]', '_', name)
-        name = name.strip()
-        name = re.sub(r'_{2,}', '_', name)
-        return name
+        return sanitize_filename(name)
 
     # --- SpotDL pipeline path: extract embedded lyrics from audio files ---
     def extract_lyrics_from_audio(self, audio_path: str) -> Optional[str]:
@@ -148,8 +185,7 @@ class LyricsService:
             if not txt_path:
                 base = os.path.splitext(os.path.basename(audio_path))[0]
                 txt_path = os.path.join(base_dir, f"{base}.txt")
-            with open(txt_path, 'w', encoding='utf-8') as f:
-                f.write(lyrics)
+            _write_text(txt_path, lyrics)
             logger.info("Exported embedded lyrics to %s", txt_path)
             return txt_path
         except Exception as e:
@@ -170,37 +206,43 @@ class LyricsService:
         return query or None
 
     def fetch_remote_lyrics(self, title: Optional[str], artists: Optional[Iterable[str]]) -> Optional[str]:
+        return self._search_synced(title, artists)[0]
+
+    def _search_synced(self, title: Optional[str], artists: Optional[Iterable[str]]) -> Tuple[Optional[str], bool]:
+        """Return ``(lyrics, answered)``; ``answered`` is False when the lookup could not run or failed."""
+        syncedlyrics = _load_syncedlyrics()
         if syncedlyrics is None:
             logger.debug("syncedlyrics library not available; skipping remote lyrics fetch")
-            return None
+            return None, False
         query = self._build_query(title, artists)
         if not query:
-            return None
+            return None, False
         try:
             logger.debug("Attempting remote lyrics lookup for query: %s", query)
             text = syncedlyrics.search(query)
         except Exception as exc:  # pragma: no cover - network/provider issues
             logger.warning("Remote lyrics search failed for %s: %s", query, exc)
-            return None
+            return None, False
         if not text:
             logger.debug("Remote lyrics providers returned no results for %s", query)
-            return None
-        cleaned = text.strip()
-        if not cleaned:
-            return None
-        return cleaned
+            return None, True
+        return text.strip() or None, True
 
     def fetch_genius_lyrics(self, title: Optional[str], artists: Optional[Iterable[str]]) -> Optional[str]:
+        return self._search_genius(title, artists)[0]
+
+    def _search_genius(self, title: Optional[str], artists: Optional[Iterable[str]]) -> Tuple[Optional[str], bool]:
+        """Return ``(lyrics, answered)``; ``answered`` is False without a token or on request errors."""
         token = Config.GENIUS_ACCESS_TOKEN
         if not token:
             logger.debug("GENIUS_ACCESS_TOKEN not configured; skipping Genius lookup")
-            return None
+            return None, False
         query = self._build_query(title, artists)
         if not query:
-            return None
+            return None, False
         headers = {"Authorization": f"Bearer {token}"}
         try:
-            resp = requests.get(
+            resp = self._http.get(
                 "https://api.genius.com/search",
                 params={"q": query},
                 headers=headers,
@@ -210,25 +252,27 @@ class LyricsService:
             data = resp.json()
         except Exception as exc:
             logger.warning("Genius search failed for %s: %s", query, exc)
-            return None
+            return None, False
         hits = data.get("response", {}).get("hits", [])
         if not hits:
             logger.debug("Genius search returned no hits for %s", query)
-            return None
+            return None, True
         url = hits[0]["result"].get("url")
         if not url:
-            return None
+            return None, True
         try:
-            page = requests.get(url, timeout=10)
+            page = self._http.get(url, timeout=10)
             page.raise_for_status()
         except Exception as exc:
             logger.warning("Failed to fetch Genius page %s: %s", url, exc)
-            return None
+            return None, False
+        from bs4 import BeautifulSoup  # deferred: only needed on the Genius fallback
+
         soup = BeautifulSoup(page.text, "html.parser")
         containers = soup.select("div[class^='Lyrics__Container'], .lyrics")
         if not containers:
             logger.debug("No lyric containers found on Genius page %s", url)
-            return None
+            return None, True
         lines = []
         for div in containers:
             # Replace <br> with newlines for readability
@@ -240,8 +284,44 @@ class LyricsService:
         lyrics = "\n".join(lines).strip()
         if not lyrics:
             logger.debug("Extracted empty lyrics from Genius page %s", url)
+            return None, True
+        return lyrics, True
+
+    @staticmethod
+    def _remote_cache_key(title: Optional[str], artists: Optional[Iterable[str]]) -> Optional[str]:
+        if not title:
             return None
-        return lyrics
+        if artists is None:
+            artist_part = ""
+        elif isinstance(artists, str):
+            artist_part = artists
+        else:
+            artist_part = ", ".join(a for a in artists if a)
+        raw = f"{title.strip().lower()}\x00{artist_part.strip().lower()}"
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def lookup_remote_lyrics(self, title: Optional[str], artists: Optional[Iterable[str]]) -> Optional[str]:
+        """Remote lyrics via syncedlyrics, then Genius, memoised per (title, artists)."""
+        cache = self.remote_cache
+        key = self._remote_cache_key(title, artists) if cache is not None else None
+        if key is not None:
+            cached = cache.get(("lyrics", key), MISSING)
+            if cached is not MISSING:
+                return cached or None
+
+        remote, synced_answered = self._search_synced(title, artists)
+        genius_answered = True
+        if not remote:
+            remote, genius_answered = self._search_genius(title, artists)
+
+        if key is not None:
+            if remote:
+                cache.set(("lyrics", key), remote)
+            elif synced_answered and genius_answered:
+                # Only a "no lyrics" from both providers is a miss; errors, timeouts
+                # and a missing Genius token are retried on the next lookup
+                cache.set(("lyrics", key), _LYRICS_MISS, ttl=Config.LYRICS_CACHE_MISS_TTL_SECONDS)
+        return remote
 
     def ensure_lyrics(
         self,
@@ -254,32 +334,38 @@ class LyricsService:
 
         Order of operations:
             1. Attempt to export embedded lyrics from the audio container.
-            2. If none are embedded, query remote providers (syncedlyrics).
+            2. If none are embedded, query remote providers (syncedlyrics, then
+               Genius), answering repeat lookups from the on-disk lyrics memo.
+
+        A non-empty lyrics file left by an earlier run is reused as-is.
 
         Returns the path to the lyrics file if written, otherwise None.
         """
+        existing = f"{os.path.splitext(audio_path)[0]}.txt"
+        try:
+            if os.path.getsize(existing) > 0:
+                return existing
+        except OSError:
+            pass
+
         embedded = self.export_embedded_lyrics(audio_path)
         if embedded:
             return embedded
 
-        remote = self.fetch_remote_lyrics(title, artists)
+        remote = self.lookup_remote_lyrics(title, artists)
         if not remote:
-            genius = self.fetch_genius_lyrics(title, artists)
-            if not genius:
-                logger.info(
-                    "Lyrics not found for %s (artists=%s)",
-                    title or os.path.splitext(os.path.basename(audio_path))[0],
-                    ", ".join(artists) if artists else "unknown",
-                )
-                return None
-            remote = genius
+            logger.info(
+                "Lyrics not found for %s (artists=%s)",
+                title or os.path.splitext(os.path.basename(audio_path))[0],
+                ", ".join(artists) if artists else "unknown",
+            )
+            return None
 
         base_dir = os.path.dirname(audio_path)
         base_name = os.path.splitext(os.path.basename(audio_path))[0]
         txt_path = os.path.join(base_dir, f"{base_name}.txt")
         try:
-            with open(txt_path, 'w', encoding='utf-8') as f:
-                f.write(remote)
+            _write_text(txt_path, remote)
             logger.info("Fetched remote lyrics for %s -> %s", title or base_name, txt_path)
             return txt_path
         except Exception as exc:
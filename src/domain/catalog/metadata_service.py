@@ -1,13 +1,59 @@
 # src/metadata_service.py
-import spotipy
-from spotipy.oauth2 import SpotifyClientCredentials
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
 
 from config import Config
-from src.utils.cache import TTLCache, MISSING
+from src.infrastructure.spotify import get_spotify_client
+from src.utils.cache import AdaptiveTTL, TTLCache, MISSING
+from src.utils.persistent_cache import SQLiteCache
+from src.utils.spotify_links import parse_spotify_link
 
 logger = logging.getLogger(__name__)
 
+_track_core = itemgetter('id', 'name')
+
+_ALBUM_PAGE_SIZE = 50
+_PLAYLIST_PAGE_SIZE = 100
+_PAGE_FETCH_WORKERS = 4
+# Only the columns get_tracks_details reads; keeps playlist pages small
+_PLAYLIST_ITEM_FIELDS = (
+    'items(added_at,added_by.id,track(id,name,artists(name),duration_ms,track_number,'
+    'disc_number,explicit,external_urls,album(id,name,images))),next,total'
+)
+
+
+def _track_entry(track_item, album_image_url):
+    """Fields shared by album, track and playlist entries in get_tracks_details."""
+    spotify_id, title = _track_core(track_item)
+    get = track_item.get
+    return {
+        'spotify_id': spotify_id,
+        'title': title,
+        'artists': [a['name'] for a in get('artists') or ()],
+        'duration_ms': get('duration_ms'),
+        'track_number': get('track_number'),
+        'disc_number': get('disc_number'),
+        'explicit': get('explicit'),
+        'spotify_url': (get('external_urls') or {}).get('spotify'),
+        'album_image_url': album_image_url,
+    }
+
+
+def _add_album_fields(entry, album):
+    entry['album_name'] = album.get('name')
+    entry['album_spotify_id'] = album.get('id')
+
+
+def _playlist_entry(item, track_item):
+    album = track_item.get('album') or {}
+    album_images = album.get('images') or ()
+    entry = _track_entry(track_item, album_images[0]['url'] if album_images else None)
+    _add_album_fields(entry, album)
+    entry['added_at'] = item.get('added_at')
+    entry['added_by_id'] = (item.get('added_by') or {}).get('id')
+    return entry
+
 class MetadataService:
     def __init__(self, spotify_client_id=None,
                  spotify_client_secret=None,
@@ -21,49 +67,69 @@ class MetadataService:
         if not self.sp:
             if spotify_client_id and spotify_client_secret:
                 try:
-                    self.sp = spotipy.Spotify(auth_manager=SpotifyClientCredentials(
-                        client_id=spotify_client_id,
-                        client_secret=spotify_client_secret
-                    ))
+                    self.sp = get_spotify_client(spotify_client_id, spotify_client_secret)
                     logger.info("Spotipy client initialized successfully in MetadataService.")
                 except Exception as e:
-                    logger.error(f"Failed to initialize Spotipy client in MetadataService: {e}")
+                    logger.error("Failed to initialize Spotipy client in MetadataService: %s", e)
                     self.sp = None
             else:
                 logger.warning("Spotify client ID and secret not provided in Config or args. MetadataService will be limited.")
 
         self._cache = TTLCache(maxsize=Config.METADATA_CACHE_MAXSIZE, ttl=Config.METADATA_CACHE_TTL_SECONDS)
+        self._ttl_policy = AdaptiveTTL(
+            Config.METADATA_CACHE_TTL_SECONDS,
+            min_ttl=Config.METADATA_CACHE_MIN_TTL_SECONDS,
+            max_ttl=Config.METADATA_CACHE_MAX_TTL_SECONDS,
+        )
+        # Last value seen per key, kept past expiry so refetches can tell whether
+        # the payload changed. Holds references to the cached objects, not copies.
+        self._last_seen = TTLCache(maxsize=Config.METADATA_CACHE_MAXSIZE, ttl=self._ttl_policy.max_ttl)
+        self._disk_cache = None
+        if Config.METADATA_CACHE_DB_PATH:
+            try:
+                self._disk_cache = SQLiteCache(Config.METADATA_CACHE_DB_PATH, ttl=Config.METADATA_CACHE_TTL_SECONDS)
+                self._disk_cache.purge_expired()
+            except Exception as e:
+                logger.warning("Persistent metadata cache unavailable, using memory only: %s", e)
+                self._disk_cache = None
+
+    def _cache_get(self, cache_key):
+        """Look up memory first, then the on-disk cache (promoting hits into memory)."""
+        cached = self._cache.get(cache_key, MISSING)
+        if cached is not MISSING or self._disk_cache is None:
+            return cached
+        cached, remaining = self._disk_cache.get_with_expiry(cache_key)
+        if cached is not MISSING:
+            self._cache.set(cache_key, cached, ttl=remaining)
+        return cached
+
+    def _cache_put(self, kind, cache_key, value):
+        """Cache ``value`` with a TTL adapted to how often ``kind`` changes."""
+        previous = self._last_seen.get(cache_key, MISSING)
+        if previous is not MISSING:
+            self._ttl_policy.record(kind, previous != value)
+        self._last_seen.set(cache_key, value)
+        ttl = self._ttl_policy.ttl_for(kind)
+        self._cache.set(cache_key, value, ttl=ttl)
+        if self._disk_cache is not None:
+            self._disk_cache.set(cache_key, value, ttl=ttl)
 
     def _get_item_type(self, spotify_link):
         """Determines the type of Spotify item from its link."""
-        link_lower = spotify_link.lower()
-        if "album" in link_lower:
-            return "album"
-        elif "track" in link_lower:
-            return "track"
-        elif "playlist" in link_lower:
-            return "playlist"
-        return "unknown"
+        return parse_spotify_link(spotify_link)[0]
 
     def _extract_id_from_url(self, spotify_link):
         """Extracts the Spotify ID from the provided link.
 
-        This helper normalizes links that may contain query strings or trailing
-        slashes which would otherwise result in an empty ID when simply
-        splitting on '/' and '?'.
+        Query strings and trailing slashes are ignored, so they never result
+        in an empty ID.
         """
-        from urllib.parse import urlparse
-
-        path = urlparse(spotify_link).path
-        segments = [segment for segment in path.split('/') if segment]
-        if segments:
-            return segments[-1]
-        return ""
+        return parse_spotify_link(spotify_link)[1]
 
     def get_album_by_id(self, album_id):
         """ Fetches detailed metadata for a specific Spotify album by its ID. """
         cache_key = ('album_metadata', album_id)
-        cached = self._cache.get(cache_key, MISSING)
+        cached = self._cache_get(cache_key)
         if cached is not MISSING:
             return cached
 
@@ -84,16 +150,20 @@ class MetadataService:
                     'release_date': album_info.get('release_date'),
                     'total_tracks': album_info.get('total_tracks')
                 }
-            self._cache.set(cache_key, album_data)
+                # The album object embeds the first tracks page; keep it so
+                # get_tracks_details does not ask for the same page again
+                if album_info.get('tracks'):
+                    self._cache_put('album', ('album_tracks_first_page', album_id), album_info['tracks'])
+            self._cache_put('album', cache_key, album_data)
             return album_data
         except Exception as e:
-            logger.exception(f"Error fetching Spotify album details for ID {album_id}: {e}")
+            logger.exception("Error fetching Spotify album details for ID %s: %s", album_id, e)
             return None
 
     def get_metadata_from_link(self, spotify_link):
         """ Fetches metadata for a given Spotify link (track, album, or playlist). """
         cache_key = ('metadata_from_link', spotify_link)
-        cached = self._cache.get(cache_key, MISSING)
+        cached = self._cache_get(cache_key)
         if cached is not MISSING:
             return cached
 
@@ -101,29 +171,29 @@ class MetadataService:
             logger.error("Spotipy client not initialized. Cannot fetch metadata.")
             return None
 
-        item_type = self._get_item_type(spotify_link)
+        item_type, item_id = parse_spotify_link(spotify_link)
         try:
             if item_type == "album":
-                album_id = self._extract_id_from_url(spotify_link)
+                album_id = item_id
                 if not album_id:
-                    logger.warning(f"Could not parse album ID from {spotify_link}")
+                    logger.warning("Could not parse album ID from %s", spotify_link)
                     return None
                 result = self.get_album_by_id(album_id)
-                self._cache.set(cache_key, result)
+                self._cache_put(item_type, cache_key, result)
                 return result
             elif item_type == "track":
-                track_id = self._extract_id_from_url(spotify_link)
+                track_id = item_id
                 if not track_id:
-                    logger.warning(f"Could not parse track ID from {spotify_link}")
+                    logger.warning("Could not parse track ID from %s", spotify_link)
                     return None
                 raw_track_key = ('track_metadata_raw', track_id)
-                track_info = self._cache.get(raw_track_key, MISSING)
+                track_info = self._cache_get(raw_track_key)
                 if track_info is MISSING:
                     track_info = self.sp.track(track_id)
                     if track_info:
-                        self._cache.set(raw_track_key, track_info)
+                        self._cache_put('track', raw_track_key, track_info)
                     else:
-                        logger.warning(f"No track metadata returned for {track_id}")
+                        logger.warning("No track metadata returned for %s", track_id)
                         return None
                 album_info = track_info.get('album', {}) if track_info else {}
                 result = {
@@ -134,21 +204,21 @@ class MetadataService:
                     'spotify_url': track_info.get('external_urls', {}).get('spotify'),
                     'item_type': 'track',
                 }
-                self._cache.set(cache_key, result)
+                self._cache_put(item_type, cache_key, result)
                 return result
             elif item_type == "playlist":
-                playlist_id = self._extract_id_from_url(spotify_link)
+                playlist_id = item_id
                 if not playlist_id:
-                    logger.warning(f"Could not parse playlist ID from {spotify_link}")
+                    logger.warning("Could not parse playlist ID from %s", spotify_link)
                     return None
                 raw_playlist_key = ('playlist_metadata_raw', playlist_id)
-                playlist_info = self._cache.get(raw_playlist_key, MISSING)
+                playlist_info = self._cache_get(raw_playlist_key)
                 if playlist_info is MISSING:
                     playlist_info = self.sp.playlist(playlist_id)
                     if playlist_info:
-                        self._cache.set(raw_playlist_key, playlist_info)
+                        self._cache_put('playlist', raw_playlist_key, playlist_info)
                     else:
-                        logger.warning(f"No playlist metadata returned for {playlist_id}")
+                        logger.warning("No playlist metadata returned for %s", playlist_id)
                         return None
                 result = {
                     'spotify_id': playlist_info['id'],
@@ -158,19 +228,39 @@ class MetadataService:
                     'spotify_url': playlist_info.get('external_urls', {}).get('spotify'),
                     'item_type': 'playlist',
                 }
-                self._cache.set(cache_key, result)
+                self._cache_put(item_type, cache_key, result)
                 return result
             else:
-                logger.warning(f"Unsupported Spotify link type: {spotify_link}")
+                logger.warning("Unsupported Spotify link type: %s", spotify_link)
                 return None
         except Exception as e:
-            logger.exception(f"Error fetching Spotify metadata for {spotify_link}: {e}")
+            logger.exception("Error fetching Spotify metadata for %s: %s", spotify_link, e)
             return None
 
+    @staticmethod
+    def _fetch_all_pages(fetch_page, page_size):
+        """Fetch every page of a Spotify paging object.
+
+        The first page reports ``total``, so the remaining offsets are known up
+        front and fetched concurrently instead of walking ``next`` links one
+        round trip at a time. Items are returned in offset order.
+        """
+        first = fetch_page(0) or {}
+        items = list(first.get('items') or [])
+        total = first.get('total') or 0
+        offsets = list(range(page_size, total, page_size))
+        if not offsets:
+            return items
+        workers = min(len(offsets), _PAGE_FETCH_WORKERS)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="spotify-pages") as executor:
+            for page in executor.map(fetch_page, offsets):
+                items.extend((page or {}).get('items') or [])
+        return items
+
     def get_tracks_details(self, spotify_id, item_type, image_url_from_metadata):
         """ Fetches detailed track information for albums, tracks, or playlists. """
         cache_key = ('track_details', item_type, spotify_id, image_url_from_metadata)
-        cached = self._cache.get(cache_key, MISSING)
+        cached = self._cache_get(cache_key)
         if cached is not MISSING:
             return cached
 
@@ -181,68 +271,49 @@ class MetadataService:
         detailed_tracks_list = []
         try:
             if item_type == "album":
-                album_tracks_response = self.sp.album_tracks(spotify_id)
-                for track_item in album_tracks_response['items']:
-                    track_artists = [a['name'] for a in track_item.get('artists', [])]
-                    detailed_tracks_list.append({
-                        'spotify_id': track_item['id'],
-                        'title': track_item['name'],
-                        'artists': track_artists,
-                        'duration_ms': track_item.get('duration_ms'),
-                        'track_number': track_item.get('track_number'),
-                        'disc_number': track_item.get('disc_number'),
-                        'explicit': track_item.get('explicit'),
-                        'spotify_url': track_item.get('external_urls', {}).get('spotify'),
-                        'album_image_url': image_url_from_metadata,
-                    })
+                first_page = self._cache_get(('album_tracks_first_page', spotify_id))
+
+                def _album_page(offset):
+                    if offset == 0 and first_page is not MISSING and first_page.get('limit') == _ALBUM_PAGE_SIZE:
+                        return first_page
+                    return self.sp.album_tracks(spotify_id, limit=_ALBUM_PAGE_SIZE, offset=offset)
+
+                album_track_items = self._fetch_all_pages(_album_page, _ALBUM_PAGE_SIZE)
+                detailed_tracks_list = [
+                    _track_entry(track_item, image_url_from_metadata) for track_item in album_track_items
+                ]
             elif item_type == "track":
-                track_item = self.sp.track(spotify_id)
-                track_artists = [a['name'] for a in track_item.get('artists', [])]
-                detailed_tracks_list.append({
-                    'spotify_id': track_item['id'],
-                    'title': track_item['name'],
-                    'artists': track_artists,
-                    'duration_ms': track_item.get('duration_ms'),
-                    'track_number': track_item.get('track_number'),
-                    'disc_number': track_item.get('disc_number'),
-                    'explicit': track_item.get('explicit'),
-                    'spotify_url': track_item.get('external_urls', {}).get('spotify'),
-                    'album_name': track_item.get('album',{}).get('name'),
-                    'album_spotify_id': track_item.get('album',{}).get('id'),
-                    'album_image_url': image_url_from_metadata,
-                })
+                # get_metadata_from_link already fetched this payload for most callers
+                raw_track_key = ('track_metadata_raw', spotify_id)
+                track_item = self._cache_get(raw_track_key)
+                if track_item is MISSING:
+                    track_item = self.sp.track(spotify_id)
+                    if track_item:
+                        self._cache_put('track', raw_track_key, track_item)
+                entry = _track_entry(track_item, image_url_from_metadata)
+                _add_album_fields(entry, track_item.get('album') or {})
+                detailed_tracks_list.append(entry)
             elif item_type == "playlist":
-                playlist_items_response = self.sp.playlist_items(spotify_id)
-                all_playlist_tracks = playlist_items_response['items']
-                while playlist_items_response['next']:
-                    playlist_items_response = self.sp.next(playlist_items_response)
-                    all_playlist_tracks.extend(playlist_items_response['items'])
-
-                for item in all_playlist_tracks:
-                    track_item = item.get('track')
-                    if track_item and track_item.get('id'):
-                        album_images = track_item.get('album',{}).get('images', [])
-                        playlist_track_album_image_url = album_images[0]['url'] if album_images else None
-                        track_artists = [a['name'] for a in track_item.get('artists', [])]
-                        detailed_tracks_list.append({
-                            'spotify_id': track_item['id'],
-                            'title': track_item['name'],
-                            'artists': track_artists,
-                            'duration_ms': track_item.get('duration_ms'),
-                            'track_number': track_item.get('track_number'),
-                            'disc_number': track_item.get('disc_number'),
-                            'explicit': track_item.get('explicit'),
-                            'spotify_url': track_item.get('external_urls', {}).get('spotify'),
-                            'album_name': track_item.get('album',{}).get('name'),
-                            'album_spotify_id': track_item.get('album',{}).get('id'),
-                            'album_image_url': playlist_track_album_image_url,
-                            'added_at': item.get('added_at'),
-                            'added_by_id': item.get('added_by', {}).get('id'),
-                        })
+                all_playlist_tracks = self._fetch_all_pages(
+                    lambda offset: self.sp.playlist_items(
+                        spotify_id,
+                        fields=_PLAYLIST_ITEM_FIELDS,
+                        limit=_PLAYLIST_PAGE_SIZE,
+                        offset=offset,
+                        additional_types=('track',),
+                    ),
+                    _PLAYLIST_PAGE_SIZE,
+                )
+                # Local tracks and removed items come back with no track or id
+                detailed_tracks_list = [
+                    _playlist_entry(item, track_item)
+                    for item in all_playlist_tracks
+                    if (track_item := item.get('track')) and track_item.get('id')
+                ]
         except Exception as e:
-            logger.exception(f"Error fetching detailed track list for {item_type} ID {spotify_id}: {e}")
+            logger.exception("Error fetching detailed track list for %s ID %s: %s", item_type, spotify_id, e)
         else:
-            self._cache.set(cache_key, detailed_tracks_list)
+            self._cache_put(item_type, cache_key, detailed_tracks_list)
         return detailed_tracks_list
 
 
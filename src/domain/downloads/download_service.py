@@ -7,23 +7,30 @@ subprocess paths have been removed.
 
 import logging
 import os
-import re
+import shutil
 import requests
 
 from config import Config
+from src.infrastructure.http import get_shared_session
+from src.utils.filenames import sanitize_filename
 
 logger = logging.getLogger(__name__)
 
 
+COPY_BUFFER_SIZE = 64 * 1024
+
+
 class AudioCoverDownloadService:
     def __init__(self, base_output_dir=None,
                  spotdl_audio_source=None,
-                 spotdl_format=None):
+                 spotdl_format=None,
+                 http_session=None):
         """Initializes the service using Config defaults if not provided.
 
         :param base_output_dir: The base directory where downloaded content will be saved.
         :param spotdl_audio_source: The audio source to use for spotdl (e.g., "youtube-music", "youtube", "spotify").
         :param spotdl_format: The audio format to download (e.g., "opus", "mp3", "flac").
+        :param http_session: Optional requests.Session; defaults to the shared keep-alive session.
         """
         # Fallback to Config values when args are not provided
         self.base_output_dir = base_output_dir or Config.BASE_OUTPUT_DIR
@@ -31,15 +38,14 @@ class AudioCoverDownloadService:
         # its own settings in the dedicated client.
         self.spotdl_audio_source = spotdl_audio_source or Config.SPOTDL_AUDIO_SOURCE
         self.spotdl_format = spotdl_format or Config.SPOTDL_FORMAT
-        os.makedirs(self.base_output_dir, exist_ok=True)
-        logger.info(f"Download helpers initialized with base output directory: {self.base_output_dir}")
+        self._http = http_session or get_shared_session()
+        # FileManager owns creation of the base and per-item directories; covers
+        # are only ever written into folders it has already created.
+        logger.info("Download helpers initialized with base output directory: %s", self.base_output_dir)
 
     def _sanitize_filename(self, name):
         """Sanitizes a string to be used as a filename."""
-        name = re.sub(r'[\\/:*?"<>|]', '_', name)
-        name = name.strip()
-        name = re.sub(r'_{2,}', '_', name)
-        return name
+        return sanitize_filename(name)
 
     # All audio downloading is handled via SpotDL API in the orchestrator.
     # This service no longer downloads audio directly.
@@ -57,22 +63,53 @@ class AudioCoverDownloadService:
             return None
 
         local_image_path = os.path.join(output_dir, filename)
+        etag_path = os.path.join(output_dir, f".{filename}.etag")
+        headers = {}
+        if os.path.exists(local_image_path):
+            etag = self._read_etag(etag_path)
+            if etag:
+                headers['If-None-Match'] = etag
         try:
-            logger.info(f"Attempting to download cover art from {image_url} to {local_image_path}")
-            response = requests.get(image_url, stream=True, timeout=15)
-            response.raise_for_status()
-
-            with open(local_image_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
-            logger.info(f"Successfully downloaded cover art to {local_image_path}")
+            logger.info("Attempting to download cover art from %s to %s", image_url, local_image_path)
+            with self._http.get(image_url, stream=True, timeout=15, headers=headers) as response:
+                if response.status_code == 304:
+                    logger.info("Cover art unchanged, keeping %s", local_image_path)
+                    return local_image_path
+                response.raise_for_status()
+
+                # Let the raw urllib3 stream undo any Content-Encoding, then copy it in C
+                response.raw.decode_content = True
+                with open(local_image_path, 'wb') as f:
+                    shutil.copyfileobj(response.raw, f, COPY_BUFFER_SIZE)
+                self._write_etag(etag_path, response.headers.get('ETag'))
+            logger.info("Successfully downloaded cover art to %s", local_image_path)
             return local_image_path
         except requests.exceptions.Timeout:
-            logger.error(f"Timeout while trying to download cover art from {image_url}")
+            logger.error("Timeout while trying to download cover art from %s", image_url)
             return None
         except requests.exceptions.RequestException as e:
-            logger.error(f"Failed to download cover art from {image_url}: {e}")
+            logger.error("Failed to download cover art from %s: %s", image_url, e)
             return None
         except IOError as e:
-            logger.error(f"Failed to save cover art to {local_image_path}: {e}")
+            logger.error("Failed to save cover art to %s: %s", local_image_path, e)
+            return None
+
+    @staticmethod
+    def _read_etag(etag_path):
+        try:
+            with open(etag_path, 'r', encoding='utf-8') as f:
+                return f.read().strip() or None
+        except OSError:
             return None
+
+    @staticmethod
+    def _write_etag(etag_path, etag):
+        """Remember the cover's ETag so re-runs can revalidate with a cheap 304."""
+        try:
+            if etag:
+                with open(etag_path, 'w', encoding='utf-8') as f:
+                    f.write(etag)
+            elif os.path.exists(etag_path):
+                os.remove(etag_path)
+        except OSError as e:
+            logger.debug("Could not update cover ETag at %s: %s", etag_path, e)
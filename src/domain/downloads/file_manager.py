@@ -1,59 +1,118 @@
-import os
-import re
+import json
 import logging
+import os
 
 from config import Config
+from src.utils.filenames import sanitize_filename
+
+try:  # optional: much faster than json.dump(indent=...) on large playlists
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore
 
 logger = logging.getLogger(__name__)
 
+
+AUDIO_EXTENSIONS = ('.mp3', '.flac', '.m4a', '.opus', '.ogg', '.wav')
+
 class FileManager:
     def __init__(self, base_output_dir=None):
         """Initializes the FileManager.
 
         :param base_output_dir: The base directory for all downloads.
         """
+        self._dirs_created = set()
         self.base_output_dir = base_output_dir or Config.BASE_OUTPUT_DIR
-        os.makedirs(self.base_output_dir, exist_ok=True)
-        logger.info(f"FileManager initialized with base output directory: {self.base_output_dir}")
+        self.ensure_directory(self.base_output_dir)
+        logger.info("FileManager initialized with base output directory: %s", self.base_output_dir)
+
+    @property
+    def base_output_dir(self):
+        return self._base_output_dir
+
+    @base_output_dir.setter
+    def base_output_dir(self, value):
+        # Settings updates reassign this at runtime; keep the joined prefix in step
+        self._base_output_dir = value
+        self._base_prefix = value if value.endswith(('/', os.sep)) else f"{value}{os.sep}"
 
     def sanitize_filename(self, name):
         """
         Sanitizes a string to be used as a filename or directory name.
         """
-        name = re.sub(r'[\\/:*?"<>|]', '_', name)
-        name = name.strip()
-        name = re.sub(r'_{2,}', '_', name)
-        return name
+        return sanitize_filename(name)
+
+    def ensure_directory(self, path):
+        """Create ``path`` if needed, remembering directories already made.
+
+        A remembered directory costs a single stat instead of makedirs' mkdir
+        attempt per component; the stat still catches folders removed since
+        (cancelled downloads, deletes from the library).
+        """
+        if path in self._dirs_created and os.path.isdir(path):
+            return
+        os.makedirs(path, exist_ok=True)
+        self._dirs_created.add(path)
 
     def create_item_output_directory(self, artist_name, item_title):
         #Creates a dedicated output directory for a specific Spotify item (album, track, playlist).
         sanitized_artist = self.sanitize_filename(artist_name)
         sanitized_title = self.sanitize_filename(item_title)
         
-        item_specific_output_dir = os.path.join(
-            self.base_output_dir,
-            f"{sanitized_artist} - {sanitized_title}"
-        )
+        item_specific_output_dir = f"{self._base_prefix}{sanitized_artist} - {sanitized_title}"
 
         try:
-            os.makedirs(item_specific_output_dir, exist_ok=True)
-            logger.info(f"Ensured output directory exists: {item_specific_output_dir}")
+            self.ensure_directory(item_specific_output_dir)
+            logger.info("Ensured output directory exists: %s", item_specific_output_dir)
             return item_specific_output_dir
         except OSError as e:
-            logger.error(f"Could not create directory {item_specific_output_dir}: {e}")
+            logger.error("Could not create directory %s: %s", item_specific_output_dir, e)
             return None
 
+    def list_audio_files(self, output_dir, extensions=AUDIO_EXTENSIONS):
+        """Return audio file paths under ``output_dir`` (recursive, via os.scandir).
+
+        spotDL writes into a sub-folder named after the output template, so the
+        walk descends into child directories.
+        """
+        found = []
+        pending = [output_dir]
+        while pending:
+            current = pending.pop()
+            try:
+                with os.scandir(current) as it:
+                    for entry in it:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                pending.append(entry.path)
+                            elif entry.is_file() and entry.name.lower().endswith(extensions):
+                                found.append(entry.path)
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+        return found
+
     def save_metadata_json(self, output_dir, metadata):
         #Saves metadata as a JSON file in the specified directory.
         metadata_json_path = os.path.join(output_dir, "spotify_metadata.json")
         try:
-            with open(metadata_json_path, 'w', encoding='utf-8') as f:
-                import json
-                json.dump(metadata, f, ensure_ascii=False, indent=4)
-            logger.info(f"Spotify metadata saved to {metadata_json_path}")
+            payload = None
+            if orjson is not None:
+                try:
+                    payload = orjson.dumps(metadata, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+                except TypeError:
+                    payload = None  # fall back to stdlib for types orjson rejects
+            if payload is not None:
+                with open(metadata_json_path, 'wb') as f:
+                    f.write(payload)
+            else:
+                with open(metadata_json_path, 'w', encoding='utf-8') as f:
+                    json.dump(metadata, f, ensure_ascii=False, indent=2)
+            logger.info("Spotify metadata saved to %s", metadata_json_path)
             return metadata_json_path
         except IOError as e:
-            logger.error(f"Failed to save Spotify metadata to JSON at {metadata_json_path}: {e}")
+            logger.error("Failed to save Spotify metadata to JSON at %s: %s", metadata_json_path, e)
             return None
 
     def cleanup_partial_output(self, output_dir: str) -> None:
@@ -105,6 +164,6 @@ class FileManager:
                 except Exception:
                     pass
             if removed_any:
-                logger.info(f"Cleaned up temporary artifacts under {output_dir}")
+                logger.info("Cleaned up temporary artifacts under %s", output_dir)
         except Exception as e:
-            logger.debug(f"Cleanup skipped due to error: {e}", exc_info=True)
+            logger.debug("Cleanup skipped due to error: %s", e, exc_info=True)
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
 import logging
+import os
 from typing import Any, Dict, Optional, Union
 
 from src.database.db_manager import db, DownloadedItem
 from src.support.identity import resolve_user_id
 
+from .track_index import write_track_index
+
 
 logger = logging.getLogger(__name__)
 
@@ -34,6 +37,10 @@ def persist_download_item(result: Dict[str, Any], *, explicit_user_id: Optional[
     local_path = result.get("output_directory")
     local_cover_path = result.get("local_cover_image_path")
 
+    # Normalize the track file names now so lyrics/audio lookups need not
+    if local_path and os.path.isdir(local_path):
+        write_track_index(local_path)
+
     resolved_user_id = resolve_user_id(
         explicit_user_id if explicit_user_id is not None else result.get("user_id")
     )
@@ -47,6 +47,8 @@ class JobQueue:
         self._queue: Queue[Job] = Queue()
         self._jobs: Dict[str, Job] = {}
         self._by_link: Dict[tuple[int, str], str] = {}
+        # user_id -> id of the user's most recent job, for O(1) active-job lookups
+        self._active_by_user: Dict[int, str] = {}
         self._threads: list[threading.Thread] = []
         self._shutdown = False
 
@@ -58,15 +60,24 @@ class JobQueue:
     def _resolve_user_id(self, explicit_user_id: Optional[int]) -> int:
         return resolve_user_id(explicit_user_id)
 
+    def _active_job_for(self, user_id: int) -> Optional[Job]:
+        # Re-entrant: submit and cancel_active_for_user already hold the lock
+        with self._lock:
+            jid = self._active_by_user.get(user_id)
+            job = self._jobs.get(jid) if jid else None
+            if job is not None and job.status in ("pending", "in_progress"):
+                return job
+            return None
+
     def submit(self, link: str, user_id: Optional[int] = None) -> Job:
         """Submit a job if not present; returns existing job for idempotency."""
         resolved_user_id = self._resolve_user_id(user_id)
         with self._lock:
             # Enforce single active download per user (pending or in_progress)
             # If an active job exists for this user, return it instead of enqueuing a new one.
-            for j in self._jobs.values():
-                if j.user_id == resolved_user_id and j.status in ("pending", "in_progress"):
-                    return j
+            active = self._active_job_for(resolved_user_id)
+            if active is not None:
+                return active
             key = (resolved_user_id, link)
             jid = self._by_link.get(key)
             if jid:
@@ -77,6 +88,7 @@ class JobQueue:
             job = Job(id=str(uuid.uuid4()), link=link, user_id=resolved_user_id)
             self._jobs[job.id] = job
             self._by_link[key] = job.id
+            self._active_by_user[resolved_user_id] = job.id
             self._queue.put(job)
             self._persist_job(job)
             return job
@@ -93,11 +105,7 @@ class JobQueue:
     def get_active_for_user(self, user_id: Optional[int] = None) -> Optional[Job]:
         """Return active (pending or in_progress) job for user if any."""
         resolved_user_id = self._resolve_user_id(user_id)
-        with self._lock:
-            for j in self._jobs.values():
-                if j.user_id == resolved_user_id and j.status in ("pending", "in_progress"):
-                    return j
-        return None
+        return self._active_job_for(resolved_user_id)
 
     def cancel_active_for_user(self, user_id: Optional[int] = None, *, timeout: float = 8.0) -> Optional[str]:
         """Request cancellation of the active job for a user and wait briefly.
@@ -107,15 +115,14 @@ class JobQueue:
         resolved_user_id = self._resolve_user_id(user_id)
         job_id: Optional[str] = None
         with self._lock:
-            for j in self._jobs.values():
-                if j.user_id == resolved_user_id and j.status in ("pending", "in_progress"):
-                    j.cancel_event.set()
-                    j.status = "cancelled"
-                    j.result = {"status": "error", "error_code": "cancelled", "message": "Job cancelled"}
-                    self._update_job_status(j, status=j.status, result=j.result)
-                    j.event.set()
-                    job_id = j.id
-                    break
+            j = self._active_job_for(resolved_user_id)
+            if j is not None:
+                j.cancel_event.set()
+                j.status = "cancelled"
+                j.result = {"status": "error", "error_code": "cancelled", "message": "Job cancelled"}
+                self._update_job_status(j, status=j.status, result=j.result)
+                j.event.set()
+                job_id = j.id
         if job_id is not None and timeout > 0:
             try:
                 import time
@@ -240,7 +247,9 @@ class JobQueue:
                 # Respect cooperative cancellation prior to starting network work
                 if job.cancel_event.is_set():
                     raise RuntimeError("cancelled")
-                result = self.downloader.download_spotify_content(job.link, cancel_event=job.cancel_event, user_id=job.user_id)
+                result = self.downloader.download_spotify_content(
+                    job.link, cancel_event=job.cancel_event, user_id=job.user_id, job_id=job.id
+                )
                 if isinstance(result, dict):
                     if result.get("status") == "success":
                         job.result = result
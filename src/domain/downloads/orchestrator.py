@@ -3,13 +3,15 @@ import time
 from requests import exceptions as requests_exceptions
 import os
 import re
-from typing import Any, Dict, Iterable, List, Optional, Sequence, Set
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
 import threading
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from operator import itemgetter
 
-import spotipy  # Spotipy remains for browse/metadata endpoints
-from spotipy.oauth2 import SpotifyClientCredentials
 from config import Config
+from src.infrastructure.spotify import get_spotify_client  # Spotipy remains for browse/metadata endpoints
 from src.utils.cache import TTLCache, MISSING
+from src.utils.spotify_links import parse_spotify_link
 
 # Services
 from ..catalog.metadata_service import MetadataService
@@ -28,11 +30,20 @@ from src.database.db_manager import db, DownloadedTrack
 from src.utils.cancellation import CancellationRequested
 
 from src.support.user_settings import ensure_user_api_keys_applied_for_user_id, user_has_spotify_credentials
-from src.core import ProgressPublisher
+from src.core import BrokerPublisher, JobPublisher, ProgressPublisher
 
 logger = logging.getLogger(__name__)
 
+# Default ordering of the popular-artist pool (popularity, then followers)
+_POOL_DEFAULT_ORDER = itemgetter('popularity', 'followers')
+
+
 class DownloadOrchestrator:
+    _SPOTDL_REBUILD_COOLDOWN_SECONDS = 30.0
+    # Concurrent Spotify Web API calls when fanning out independent lookups
+    _SPOTIFY_FANOUT_WORKERS = 4
+    _IO_POOL_WORKERS = 4
+
     def __init__(
         self,
         base_output_dir=None,
@@ -76,13 +87,10 @@ class DownloadOrchestrator:
         self.sp = None  # Initialize to None
         if self._spotify_client_id and self._spotify_client_secret:
             try:
-                self.sp = spotipy.Spotify(auth_manager=SpotifyClientCredentials(
-                    client_id=self._spotify_client_id,
-                    client_secret=self._spotify_client_secret
-                ))
+                self.sp = get_spotify_client(self._spotify_client_id, self._spotify_client_secret)
                 logger.info("Spotipy instance initialized within DownloadOrchestrator.")
             except Exception as e:
-                logger.error(f"Failed to initialize Spotipy in DownloadOrchestrator: {e}", exc_info=True)
+                logger.error("Failed to initialize Spotipy in DownloadOrchestrator: %s", e, exc_info=True)
         else:
             logger.warning("Spotify client ID or secret missing. Spotipy instance for direct searches will not be available.")
 
@@ -91,6 +99,7 @@ class DownloadOrchestrator:
 
         # SpotDL client can be injected; if None, we create on-demand
         self._spotdl_client: Optional[SpotdlClient] = spotdl_client
+        self._spotdl_build_failed_at: Optional[float] = None
 
         # Repository for persistence (optional); default to SQLAlchemy-based
         self.repo: DownloadRepository = download_repository or DefaultDownloadRepository()
@@ -99,47 +108,175 @@ class DownloadOrchestrator:
         cache_ttl = Config.METADATA_CACHE_TTL_SECONDS
         self._artist_cache = TTLCache(maxsize=cache_maxsize, ttl=cache_ttl)
         self._artist_discography_cache = TTLCache(maxsize=cache_maxsize, ttl=cache_ttl)
+        # Best-Of builds cost a top-tracks call plus up to four search pages;
+        # the details page and the download that follows reuse one build
+        self._best_of_cache = TTLCache(maxsize=cache_maxsize, ttl=cache_ttl)
+        # Raw artist search pages keyed by normalised query and page window
+        self._artist_search_cache = TTLCache(maxsize=cache_maxsize, ttl=cache_ttl)
         # Caches popular-artist pool per market; result slicing happens per request
         self._popular_artists_cache = TTLCache(maxsize=4, ttl=Config.POPULAR_ARTIST_CACHE_TTL_SECONDS)
+        # Ordered views of those pools per (market, order_by, order_dir)
+        self._sorted_pool_cache = TTLCache(maxsize=16, ttl=Config.POPULAR_ARTIST_CACHE_TTL_SECONDS)
         self._popular_artist_playlist_ids = Config.POPULAR_ARTIST_PLAYLIST_IDS
         self._popular_artist_limit = Config.POPULAR_ARTIST_LIMIT
         self._popular_artist_pool_size = Config.POPULAR_ARTIST_POOL_SIZE
+        # Long-lived pool for side I/O (cover art) that runs alongside spotDL
+        self._io_pool = ThreadPoolExecutor(max_workers=self._IO_POOL_WORKERS, thread_name_prefix="orchestrator-io")
 
         logger.info("DownloadOrchestrator initialized with decoupled services and configuration passed.")
 
+    def _resolve_publisher(self, job_id: Optional[str] = None) -> Optional[ProgressPublisher]:
+        """Progress publisher for SSE/clients, tagged with ``job_id`` when run from the job queue."""
+        publisher = self.progress_publisher
+        if publisher is None:
+            # compat: fall back to the broker in app context
+            try:
+                from flask import current_app  # type: ignore
+                broker = current_app.extensions.get('progress_broker')
+                if broker is not None:
+                    publisher = BrokerPublisher(broker)
+            except Exception:
+                publisher = None
+        if publisher is not None and job_id is not None:
+            publisher = JobPublisher(publisher, job_id)
+        return publisher
+
     def get_spotipy_instance(self):
         """ Provides access to the initialized Spotipy instance. """
         return self.sp
 
     def _resolve_spotdl_client(self) -> Optional[SpotdlClient]:
-        """Return an injected SpotdlClient or build a default one."""
+        """Return an injected SpotdlClient or build a default one.
+
+        The in-process client is expensive to construct (spotdl import, engine
+        thread, Spotify token), so a failed build is not retried on every call.
+        """
         if self._spotdl_client is not None:
             return self._spotdl_client
+        failed_at = self._spotdl_build_failed_at
+        if failed_at is not None and time.monotonic() - failed_at < self._SPOTDL_REBUILD_COOLDOWN_SECONDS:
+            return None
         try:
             self._spotdl_client = build_default_client(app_logger=logger)
+            self._spotdl_build_failed_at = None
             return self._spotdl_client
         except Exception as e:
+            self._spotdl_build_failed_at = time.monotonic()
             logger.warning("SpotDL client unavailable; metadata-only features may still work: %s", e)
             return None
 
     def _parse_item_type(self, link: str) -> str:
-        lower = link.lower()
-        if "playlist" in lower:
-            return "playlist"
-        if "album" in lower:
-            return "album"
-        if "track" in lower:
-            return "track"
-        return "unknown"
+        return parse_spotify_link(link)[0]
 
     def _extract_spotify_id(self, link: str) -> str:
+        return parse_spotify_link(link)[1]
+
+    def _start_cover_download(self, image_url: Optional[str], output_dir: str) -> Future:
+        """Fetch cover art on the shared I/O pool so it overlaps with the audio download."""
+        return self._io_pool.submit(self.audio_cover_download_service.download_cover_image, image_url, output_dir)
+
+    @staticmethod
+    def _collect_cover(future: Future) -> Optional[str]:
         try:
-            from urllib.parse import urlparse
-            path = urlparse(link).path
-            segs = [s for s in path.split('/') if s]
-            return segs[-1] if segs else ""
-        except Exception:
-            return ""
+            return future.result()
+        except Exception as exc:
+            logger.warning("Cover art download failed: %s", exc)
+            return None
+
+    def _backfill_local_paths(self, track_dtos: List[TrackDTO], output_dir: str) -> None:
+        """Recover audio paths from disk for tracks spotDL did not report a file for."""
+        missing = [t for t in track_dtos if not t.local_path]
+        if not missing or not output_dir:
+            return
+        by_stem: Dict[str, str] = {}
+        for path in self.file_manager.list_audio_files(output_dir):
+            stem = os.path.splitext(os.path.basename(path))[0].lower()
+            by_stem.setdefault(stem, path)
+        if not by_stem:
+            return
+        for t in missing:
+            title = self.file_manager.sanitize_filename(t.title or "").lower()
+            if not title:
+                continue
+            match = by_stem.get(title)
+            if match is None:
+                suffix = f" - {title}"
+                candidates = [path for stem, path in by_stem.items() if stem.endswith(suffix)]
+                if len(candidates) == 1:
+                    match = candidates[0]
+            if match:
+                t.local_path = match
+
+    def _export_lyrics(
+        self,
+        track_dtos: List[TrackDTO],
+        publisher: Optional[ProgressPublisher],
+        event_extra: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Run ensure_lyrics for every downloaded track on a bounded thread pool.
+
+        Embedded-tag export is local, but the syncedlyrics/Genius fallbacks are
+        network-bound, so tracks are processed concurrently. Progress is still
+        published from the calling thread, one event per finished track.
+        """
+        total_tracks = len(track_dtos)
+        if not total_tracks:
+            return
+        exported_count = 0
+
+        def _publish(t: TrackDTO) -> None:
+            if publisher is None:
+                return
+            event = {
+                'song_display_name': t.title,
+                'status': f'Exporting lyrics ({exported_count}/{total_tracks})',
+                'progress': 100 if t.local_lyrics_path else 0,
+                'overall_completed': exported_count,
+                'overall_total': total_tracks,
+                'overall_progress': int((exported_count / max(1, total_tracks)) * 100),
+                'event': 'lyrics_export',
+                'lyrics_exported': bool(t.local_lyrics_path),
+                'lyrics_path': t.local_lyrics_path,
+            }
+            if event_extra:
+                event.update(event_extra)
+            try:
+                publisher.publish(event)
+            except Exception:
+                pass
+
+        pending = [t for t in track_dtos if t.local_path and not t.local_lyrics_path]
+        pending_ids = {id(t) for t in pending}
+        for t in track_dtos:
+            if id(t) not in pending_ids:
+                exported_count += 1
+                _publish(t)
+        if not pending:
+            return
+
+        # Tracks sharing a title and lead artist (repeats, alternate releases)
+        # run back to back on one worker, so only the first can reach the remote
+        # providers and the rest are answered from the lyrics memo.
+        groups: Dict[Tuple[str, str], List[TrackDTO]] = {}
+        for t in pending:
+            lead_artist = t.artists[0] if t.artists else ''
+            key = ((t.title or '').strip().lower(), (lead_artist or '').strip().lower())
+            groups.setdefault(key, []).append(t)
+
+        def _ensure_group(group: List[TrackDTO]) -> None:
+            for t in group:
+                try:
+                    t.local_lyrics_path = self.lyrics_service.ensure_lyrics(t.local_path, title=t.title, artists=t.artists)
+                except Exception as exc:
+                    logger.warning("Lyrics export failed for %s: %s", t.title, exc)
+
+        workers = max(1, min(len(groups), Config.LYRICS_EXPORT_WORKERS))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="lyrics") as executor:
+            futures = {executor.submit(_ensure_group, group): group for group in groups.values()}
+            for future in as_completed(futures):
+                for t in futures[future]:
+                    exported_count += 1
+                    _publish(t)
 
     @staticmethod
     def _chunked_iterable(sequence: Sequence[str], size: int) -> Iterable[Sequence[str]]:
@@ -177,6 +314,23 @@ class DownloadOrchestrator:
             'external_urls': (artist.get('external_urls') or {}).get('spotify'),
         }
 
+    def search_artists(self, query: str, limit: int = 20, offset: int = 0) -> Dict[str, Any]:
+        """Return Spotify's artist paging object for a search, cached per page.
+
+        Raises when the Spotify client is unavailable or the search fails;
+        failures are not cached.
+        """
+        cache_key = (' '.join(query.split()).lower(), limit, offset)
+        cached = self._artist_search_cache.get(cache_key, MISSING)
+        if cached is not MISSING:
+            return cached
+        if not self.sp:
+            raise RuntimeError('Spotipy client not initialized')
+        results = self.sp.search(q=query, type='artist', limit=limit, offset=offset) or {}
+        page = results.get('artists') or {}
+        self._artist_search_cache.set(cache_key, page)
+        return page
+
     def fetch_artist_details(self, artist_id: str) -> Optional[Dict[str, Any]]:
         cache_entry = self._artist_cache.get(artist_id, MISSING)
         if cache_entry is not MISSING:
@@ -256,21 +410,61 @@ class DownloadOrchestrator:
                 })
                 seen_titles.add(album_name_lower)
 
+        # The first page reports the total, so every remaining offset is known;
+        # fetch them together and ingest in offset order (dedup keeps the first title)
+        page_size = albums_results.get('limit') or 50
+        total = albums_results.get('total') or 0
+        offsets = list(range(page_size, total, page_size))
+        complete = True
         try:
             _ingest(albums_results.get('items', []))
-            while albums_results.get('next'):
-                albums_results = self.sp.next(albums_results)
-                _ingest(albums_results.get('items', []))
+            if offsets:
+                workers = max(1, min(len(offsets), self._SPOTIFY_FANOUT_WORKERS))
+                with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="discography-pages") as executor:
+                    pages = executor.map(
+                        lambda offset: self.sp.artist_albums(
+                            artist_id, album_type='album,single', country=market, limit=page_size, offset=offset
+                        ),
+                        offsets,
+                    )
+                    for page in pages:
+                        _ingest((page or {}).get('items', []))
         except requests_exceptions.ReadTimeout as exc:
+            complete = False
             logger.warning('Timed out paging discography for %s: %s', artist_id, exc)
         except Exception as exc:
+            complete = False
             logger.error('Error paging artist discography for %s: %s', artist_id, exc, exc_info=True)
 
-        self._artist_discography_cache.set(cache_key, discography)
+        # A partial listing is still returned, but only a complete one is cached
+        if complete:
+            self._artist_discography_cache.set(cache_key, discography)
         return discography
 
 
 
+    def _load_popular_playlist_items(self, playlist_id: str, market: str, max_items: int) -> List[Dict[str, Any]]:
+        """Return up to ``max_items`` playlist entries, following pagination."""
+        playlist_uri = playlist_id
+        if not playlist_uri.startswith(('spotify:playlist:', 'https://', 'http://')):
+            playlist_uri = f'spotify:playlist:{playlist_id}'
+        try:
+            playlist_items = self.sp.playlist_items(playlist_uri, limit=100, market=market)
+        except Exception as exc:
+            logger.warning('Failed to load playlist %s for popular artist discovery: %s', playlist_id, exc)
+            return []
+        entries: List[Dict[str, Any]] = []
+        while playlist_items:
+            entries.extend(playlist_items.get('items', []))
+            if len(entries) >= max_items or not playlist_items.get('next'):
+                break
+            try:
+                playlist_items = self.sp.next(playlist_items)
+            except Exception as exc:
+                logger.warning('Pagination failed for playlist %s: %s', playlist_id, exc)
+                break
+        return entries
+
     def fetch_popular_artists(self, limit: Optional[int] = None, market: str = 'US') -> List[Dict[str, Any]]:
         """Return a slice of a large, cached popular-artist pool.
 
@@ -291,43 +485,34 @@ class DownloadOrchestrator:
         target_unique = max(1, int(self._popular_artist_pool_size))
         playlist_ids = [pid for pid in self._popular_artist_playlist_ids if pid]
 
-        # 1) Collect unique artist IDs from curated playlists
+        # 1) Collect unique artist IDs from curated playlists. The playlists are
+        # independent, so their pages are fetched concurrently; ingestion below
+        # still walks them in configured order.
         collected_ids: List[str] = []
         seen_ids: Set[str] = set()
         if playlist_ids:
-            for playlist_id in playlist_ids:
+            workers = max(1, min(len(playlist_ids), self._SPOTIFY_FANOUT_WORKERS))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="popular-playlists") as executor:
+                playlist_entries = list(executor.map(
+                    lambda pid: self._load_popular_playlist_items(pid, market, target_unique),
+                    playlist_ids,
+                ))
+            for items in playlist_entries:
                 if len(collected_ids) >= target_unique:
                     break
-                playlist_uri = playlist_id
-                if not playlist_uri.startswith(('spotify:playlist:', 'https://', 'http://')):
-                    playlist_uri = f'spotify:playlist:{playlist_id}'
-                try:
-                    playlist_items = self.sp.playlist_items(playlist_uri, limit=100, market=market)
-                except Exception as exc:
-                    logger.warning('Failed to load playlist %s for popular artist discovery: %s', playlist_id, exc)
-                    continue
-                while playlist_items:
-                    items = playlist_items.get('items', [])
-                    for entry in items:
-                        track = entry.get('track')
-                        if not track:
+                for entry in items:
+                    track = entry.get('track')
+                    if not track:
+                        continue
+                    for artist in track.get('artists', []):
+                        artist_id = artist.get('id')
+                        if not artist_id or artist_id in seen_ids:
                             continue
-                        for artist in track.get('artists', []):
-                            artist_id = artist.get('id')
-                            if not artist_id or artist_id in seen_ids:
-                                continue
-                            seen_ids.add(artist_id)
-                            collected_ids.append(artist_id)
-                            if len(collected_ids) >= target_unique:
-                                break
+                        seen_ids.add(artist_id)
+                        collected_ids.append(artist_id)
                         if len(collected_ids) >= target_unique:
                             break
-                    if len(collected_ids) >= target_unique or not playlist_items.get('next'):
-                        break
-                    try:
-                        playlist_items = self.sp.next(playlist_items)
-                    except Exception as exc:
-                        logger.warning('Pagination failed for playlist %s: %s', playlist_id, exc)
+                    if len(collected_ids) >= target_unique:
                         break
         else:
             logger.warning('No playlist sources configured for popular artists.')
@@ -342,18 +527,26 @@ class DownloadOrchestrator:
                     artist_payloads.append(cached_artist)
             else:
                 ids_to_fetch.append(artist_id)
-        for chunk in self._chunked_iterable(ids_to_fetch, 50):
+
+        def _fetch_artist_batch(chunk: Sequence[str]) -> List[Dict[str, Any]]:
             try:
-                resp = self.sp.artists(list(chunk))
+                return self.sp.artists(list(chunk)).get('artists', [])
             except Exception as exc:
                 logger.warning('Batch artist lookup failed for %s: %s', chunk, exc)
-                continue
-            for artist in resp.get('artists', []):
-                normalized = self._normalize_artist_payload(artist)
-                if not normalized:
-                    continue
-                self._artist_cache.set(normalized['id'], normalized)
-                artist_payloads.append(normalized)
+                return []
+
+        chunks = list(self._chunked_iterable(ids_to_fetch, 50))
+        if chunks:
+            workers = max(1, min(len(chunks), self._SPOTIFY_FANOUT_WORKERS))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="popular-artists") as executor:
+                batches = list(executor.map(_fetch_artist_batch, chunks))
+            for batch in batches:
+                for artist in batch:
+                    normalized = self._normalize_artist_payload(artist)
+                    if not normalized:
+                        continue
+                    self._artist_cache.set(normalized['id'], normalized)
+                    artist_payloads.append(normalized)
 
         # 3) Top-up via diversified genre searches until pool is filled
         if len(artist_payloads) < target_unique:
@@ -402,7 +595,9 @@ class DownloadOrchestrator:
             unique_by_id[artist['id']] = artist
 
         full_pool = list(unique_by_id.values())
-        full_pool.sort(key=lambda data: ((data.get('popularity') or 0), (data.get('followers') or 0)), reverse=True)
+        # Entries are normalised (int metrics), so the default ordering needs no fallbacks;
+        # get_sorted_popular_artist_pool serves this list as-is for popularity/desc
+        full_pool.sort(key=_POOL_DEFAULT_ORDER, reverse=True)
         # Trim to pool size for consistency
         full_pool = full_pool[:target_unique]
         self._popular_artists_cache.set(pool_key, full_pool)
@@ -421,6 +616,34 @@ class DownloadOrchestrator:
             return list(cached_pool)
         return []
 
+    def get_sorted_popular_artist_pool(
+        self, market: str = 'US', order_by: str = 'popularity', order_dir: str = 'desc'
+    ) -> List[Dict[str, Any]]:
+        """Return the popular-artist pool ordered by ``order_by`` then the other metric.
+
+        Pool entries are already normalised by ``_normalize_artist_payload``, so
+        each ordering is sorted once and reused until the pool is rebuilt.
+        The returned list is shared; callers must only slice it.
+        """
+        pool_key = ('popular_pool', market)
+        pool = self._popular_artists_cache.get(pool_key, MISSING)
+        if pool is MISSING:
+            self.get_popular_artist_pool(market=market)
+            pool = self._popular_artists_cache.get(pool_key, MISSING)
+            if pool is MISSING:
+                return []
+        if (order_by, order_dir) == ('popularity', 'desc'):
+            # The pool is stored in this order already
+            return pool
+        view_key = (market, order_by, order_dir)
+        cached = self._sorted_pool_cache.get(view_key, MISSING)
+        if cached is not MISSING and cached[0] is pool:
+            return cached[1]
+        secondary = 'followers' if order_by == 'popularity' else 'popularity'
+        ordered = sorted(pool, key=itemgetter(order_by, secondary), reverse=(order_dir == 'desc'))
+        self._sorted_pool_cache.set(view_key, (pool, ordered))
+        return ordered
+
     def build_best_of_album_details(self, artist_id: str, market: str = 'US') -> Optional[Dict[str, Any]]:
         """
         Build a synthetic "Best Of" album for a given artist by selecting the most
@@ -447,6 +670,11 @@ class DownloadOrchestrator:
         effective_min = max(1, primary_min - 2)
         capacity_ms = effective_min * 60 * 1000
 
+        cache_key = (artist_id, market, primary_min)
+        cached = self._best_of_cache.get(cache_key, MISSING)
+        if cached is not MISSING:
+            return cached
+
         candidates_map: Dict[str, Any] = {}
 
         # 1) Start with Spotify's top tracks (up to 10)
@@ -550,21 +778,19 @@ class DownloadOrchestrator:
             'total_tracks': len(tracks_list),
             'tracks': tracks_list,
         }
+        self._best_of_cache.set(cache_key, result)
         return result
 
-    def _download_best_of_album(self, artist_id: str, *, cancel_event: Optional[threading.Event] = None, user_id: Optional[int] = None) -> Dict[str, Any]:
+    def _download_best_of_album(
+        self,
+        artist_id: str,
+        *,
+        cancel_event: Optional[threading.Event] = None,
+        user_id: Optional[int] = None,
+        job_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
         """Download pipeline for synthetic Best-Of albums using SpotDL on per-track URLs."""
-        # Resolve progress publisher (same behavior as main pipeline)
-        publisher = self.progress_publisher
-        if publisher is None:
-            try:
-                from flask import current_app  # type: ignore
-                broker = current_app.extensions.get('progress_broker')
-                if broker is not None:
-                    from src.core import BrokerPublisher
-                    publisher = BrokerPublisher(broker)
-            except Exception:
-                publisher = None
+        publisher = self._resolve_publisher(job_id)
 
         # Build details and track list
         details = self.build_best_of_album_details(artist_id)
@@ -583,10 +809,7 @@ class DownloadOrchestrator:
         if not item_specific_output_dir:
             return {"status": "error", "message": f"Could not create output directory for {title_name}.", "user_id": user_id}
 
-        local_cover_image_path = self.audio_cover_download_service.download_cover_image(
-            image_url_from_metadata,
-            item_specific_output_dir
-        )
+        cover_future = self._start_cover_download(image_url_from_metadata, item_specific_output_dir)
 
         # Resolve SpotDL client and search per-track Spotify URLs
         spotdl_client = self._resolve_spotdl_client()
@@ -625,7 +848,7 @@ class DownloadOrchestrator:
         failed_tracks: List[dict] = []
         try:
             sanitized_title = self.file_manager.sanitize_filename(title_name)
-            output_template = os.path.join(item_specific_output_dir, f"{sanitized_title}")
+            output_template = f"{item_specific_output_dir}{os.sep}{sanitized_title}"
             # Per-job progress callback forwards to broker and checks cancellation
             # Adjust SpotDL per-batch counters into job-scope totals
             _acc = {"base": 0, "prev": 0}
@@ -707,6 +930,8 @@ class DownloadOrchestrator:
             # Cooperative cancellation
             try:
                 if isinstance(e, CancellationRequested):
+                    # Let the cover writer finish so it cannot recreate the folder after cleanup
+                    self._collect_cover(cover_future)
                     # Cleanup partials and remove the album folder
                     try:
                         self.file_manager.cleanup_partial_output(item_specific_output_dir)
@@ -739,28 +964,7 @@ class DownloadOrchestrator:
         # Lyrics export phase
         if True:
             total_tracks = len(track_dtos)
-            exported_count = 0
-            for t in track_dtos:
-                if t.local_path and not t.local_lyrics_path:
-                    exported = self.lyrics_service.ensure_lyrics(
-                        t.local_path,
-                        title=t.title,
-                        artists=t.artists,
-                    )
-                    t.local_lyrics_path = exported
-                exported_count += 1
-                if publisher is not None:
-                    try:
-                        publisher.publish({
-                            'song_display_name': t.title,
-                            'status': f'Exporting lyrics ({exported_count}/{total_tracks})',
-                            'progress': 100 if t.local_lyrics_path else 0,
-                            'overall_completed': exported_count,
-                            'overall_total': total_tracks,
-                            'overall_progress': int((exported_count / max(1, total_tracks)) * 100),
-                        })
-                    except Exception:
-                        pass
+            self._export_lyrics(track_dtos, publisher)
             if publisher is not None:
                 try:
                     publisher.publish({
@@ -780,6 +984,8 @@ class DownloadOrchestrator:
         except Exception:
             pass
 
+        local_cover_image_path = self._collect_cover(cover_future)
+
         # Save metadata JSON
         meta_tracks = [t.model_dump() for t in track_dtos]
         comprehensive_metadata_to_save = {
@@ -871,7 +1077,7 @@ class DownloadOrchestrator:
         suffix = datetime.now().strftime('%Y%m%d-%H%M')
         comp_dir = os.path.join(self.base_output_dir, 'Compilations', f"{safe_name}-{suffix}")
         try:
-            os.makedirs(comp_dir, exist_ok=True)
+            self.file_manager.ensure_directory(comp_dir)
         except Exception as e:
             return {"status": "error", "message": f"Failed to create compilation directory: {e}"}
 
@@ -957,29 +1163,7 @@ class DownloadOrchestrator:
 
         # Export embedded lyrics where possible, publish light progress
         total_tracks = len(track_dtos)
-        exported_count = 0
-        for t in track_dtos:
-            if t.local_path and not t.local_lyrics_path:
-                exported = self.lyrics_service.ensure_lyrics(
-                    t.local_path,
-                    title=t.title,
-                    artists=t.artists,
-                )
-                t.local_lyrics_path = exported
-            exported_count += 1
-            if publisher is not None:
-                try:
-                    publisher.publish({
-                        'song_display_name': t.title,
-                        'status': f'Exporting lyrics ({exported_count}/{total_tracks})',
-                        'progress': 100 if t.local_lyrics_path else 0,
-                        'overall_completed': exported_count,
-                        'overall_total': total_tracks,
-                        'overall_progress': int((exported_count / max(1, total_tracks)) * 100),
-                        'topic': f'compilation:{safe_name}',
-                    })
-                except Exception:
-                    pass
+        self._export_lyrics(track_dtos, publisher, {'topic': f'compilation:{safe_name}'})
 
         try:
             self.repo.save_tracks(track_dtos, user_id=user_id)
@@ -1060,7 +1244,14 @@ class DownloadOrchestrator:
             'user_id': user_id,
         }
 
-    def download_spotify_content(self, spotify_link, *, cancel_event: Optional[threading.Event] = None, user_id: Optional[int] = None):
+    def download_spotify_content(
+        self,
+        spotify_link,
+        *,
+        cancel_event: Optional[threading.Event] = None,
+        user_id: Optional[int] = None,
+        job_id: Optional[str] = None,
+    ):
         """Orchestrates the download using SpotDL Song as canonical metadata source."""
         if user_id is not None:
             keys = ensure_user_api_keys_applied_for_user_id(user_id, refresh_client=False)
@@ -1074,18 +1265,9 @@ class DownloadOrchestrator:
         # Synthetic Best-Of album support: treat 'bestof:<artist_id>' like a container
         if isinstance(spotify_link, str) and spotify_link.startswith('bestof:'):
             artist_id = spotify_link.split(':', 1)[1]
-            return self._download_best_of_album(artist_id, cancel_event=cancel_event, user_id=user_id)
-        # Progress publisher for SSE/clients (compat: fall back to broker in app context)
-        publisher = self.progress_publisher
-        if publisher is None:
-            try:
-                from flask import current_app  # type: ignore
-                broker = current_app.extensions.get('progress_broker')
-                if broker is not None:
-                    from src.core import BrokerPublisher
-                    publisher = BrokerPublisher(broker)
-            except Exception:
-                publisher = None
+            return self._download_best_of_album(artist_id, cancel_event=cancel_event, user_id=user_id, job_id=job_id)
+        # Progress publisher for SSE/clients
+        publisher = self._resolve_publisher(job_id)
         # Prefer SpotDL for metadata
         spotdl_client = self._resolve_spotdl_client()
         songs = []
@@ -1118,7 +1300,7 @@ class DownloadOrchestrator:
             )
 
         # Derive resolved item type (playlist/album/track)
-        resolved_item_type = self._parse_item_type(spotify_link)
+        resolved_item_type, link_spotify_id = parse_spotify_link(spotify_link)
         if resolved_item_type != "unknown":
             item_type = resolved_item_type
         else:
@@ -1131,11 +1313,11 @@ class DownloadOrchestrator:
             if item_type == "track":
                 spotify_id = first.song_id
             elif item_type == "album":
-                spotify_id = first.album_id or self._extract_spotify_id(spotify_link)
+                spotify_id = first.album_id or link_spotify_id
             elif item_type == "playlist":
-                spotify_id = self._extract_spotify_id(spotify_link)
+                spotify_id = link_spotify_id
         else:
-            spotify_id = self._extract_spotify_id(spotify_link)
+            spotify_id = link_spotify_id
 
         artist_name = item_dto.artist
         title_name = item_dto.title
@@ -1147,12 +1329,8 @@ class DownloadOrchestrator:
         if not item_specific_output_dir:
             return {"status": "error", "message": f"Could not create output directory for {title_name}."}
 
-        # --- Download and save album cover ---
-        local_cover_image_path = self.audio_cover_download_service.download_cover_image(
-            image_url_from_metadata,
-            item_specific_output_dir
-        )
-        # --- End download and save album cover ---
+        # --- Download and save album cover (runs alongside the audio download) ---
+        cover_future = self._start_cover_download(image_url_from_metadata, item_specific_output_dir)
 
         # --- Audio download ---
         results_map = {}
@@ -1178,7 +1356,7 @@ class DownloadOrchestrator:
                     except Exception:
                         pass
                 sanitized_title = self.file_manager.sanitize_filename(title_name)
-                output_template = os.path.join(item_specific_output_dir, f"{sanitized_title}")
+                output_template = f"{item_specific_output_dir}{os.sep}{sanitized_title}"
                 # Install a per-job callback that republishes and normalizes totals
                 _acc = {"base": 0, "prev": 0}
                 def _progress_cb(ev: dict) -> None:
@@ -1290,6 +1468,8 @@ class DownloadOrchestrator:
                 # Cooperative cancellation
                 try:
                     if isinstance(e, CancellationRequested):
+                        # Let the cover writer finish so it cannot recreate the folder after cleanup
+                        self._collect_cover(cover_future)
                         try:
                             self.file_manager.cleanup_partial_output(item_specific_output_dir)
                         except Exception:
@@ -1399,6 +1579,7 @@ class DownloadOrchestrator:
                 else:
                     error_result = {"status": "error", "error_code": "internal_error", "message": f"SpotDL API download failed: {detail}"}
                 audio_failed = True
+        local_cover_image_path = self._collect_cover(cover_future)
         if not songs:
             return {"status": "error", "error_code": "search_unavailable", "message": "SpotDL search did not return results or client unavailable."}
         if audio_failed and failed_tracks and error_result and "failed_tracks" not in error_result:
@@ -1407,9 +1588,13 @@ class DownloadOrchestrator:
         # --- Build track DTOs from SpotDL songs (canonical) ---
         track_dtos: List[TrackDTO] = []
         if songs:
-            for s in songs:
-                dto = song_to_track_dto(s)
-                track_dtos.append(dto)
+            # songs_to_item_dto already mapped every Song during search; reuse
+            # those DTOs instead of re-reading each Song.json a second time.
+            # Copies: local paths are written onto them below, item_dto stays as searched.
+            if len(item_dto.tracks) == len(songs):
+                track_dtos = [t.model_copy() for t in item_dto.tracks]
+            else:
+                track_dtos = [song_to_track_dto(s) for s in songs]
         else:
             # Keep compatibility: if we don't have songs (legacy metadata path), no tracks
             track_dtos = []
@@ -1418,36 +1603,14 @@ class DownloadOrchestrator:
         # even if the download experienced partial failures.
         for t in track_dtos:
             t.local_path = results_map.get(t.spotify_url)
+        # The output folder is the ground truth for what actually landed on disk
+        if failed_tracks:
+            self._backfill_local_paths(track_dtos, item_specific_output_dir)
 
         # For SpotDL pipeline: export embedded lyrics alongside audio files (graceful if missing)
         total_tracks = len(track_dtos)
         if total_tracks:
-            exported_count = 0
-            for t in track_dtos:
-                if t.local_path and not t.local_lyrics_path:
-                    exported = self.lyrics_service.ensure_lyrics(
-                        t.local_path,
-                        title=t.title,
-                        artists=t.artists,
-                    )
-                    t.local_lyrics_path = exported
-                exported_count += 1
-                # Progress update for lyrics export phase
-                if publisher is not None:
-                    try:
-                        publisher.publish({
-                            'song_display_name': t.title,
-                            'status': f'Exporting lyrics ({exported_count}/{total_tracks})',
-                            'progress': 100 if t.local_lyrics_path else 0,
-                            'overall_completed': exported_count,
-                            'overall_total': total_tracks,
-                            'overall_progress': int((exported_count / max(1, total_tracks)) * 100),
-                            'event': 'lyrics_export',
-                            'lyrics_exported': bool(t.local_lyrics_path),
-                            'lyrics_path': t.local_lyrics_path,
-                        })
-                    except Exception:
-                        pass
+            self._export_lyrics(track_dtos, publisher)
             # Final completion event after lyrics export and persistence
             if publisher is not None and not audio_failed:
                 try:
@@ -0,0 +1,119 @@
+"""Sidecar index of the track files in a downloaded item folder.
+
+The lyrics and audio endpoints match tracks by normalized file name. The
+folder contents only change when a download writes them, so the normalized
+names are computed once at that point and stored next to the files.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from .file_manager import AUDIO_EXTENSIONS
+
+logger = logging.getLogger(__name__)
+
+TRACK_INDEX_FILENAME = '_index.json'
+_TRACK_INDEX_VERSION = 2
+
+TEXT_EXTS = ('.txt',)
+
+
+class TrackIndex(NamedTuple):
+    files: List[Tuple[str, str]]  # (relative path, normalized stem)
+    has_subdirs: bool
+
+
+# Punctuation dropped by normalize_track_name (underscores included), removed in one C-level pass
+_NORM_STRIP_TABLE = str.maketrans('', '', '\\/:*?"<>|.,!()[]{}_')
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+# Normalization helper (mirrors cd_burning_service)
+def normalize_track_name(s: str) -> str:
+    s = (s or '').lower()
+    s = s.replace('\ufffdT', "'")  # best-effort for odd apostrophes
+    s = s.translate(_NORM_STRIP_TABLE)
+    return _WHITESPACE_RE.sub('', s)
+
+
+def build_track_index(base_dir: str) -> Tuple[List[Tuple[str, str]], Dict[str, int]]:
+    """Return the audio/lyrics files and the mtime of every folder below ``base_dir``.
+
+    Files are ``(relative path, normalized stem)`` with forward slashes, the
+    folder's own files first; folders are keyed the same way (``''`` for
+    ``base_dir`` itself).
+    """
+    entries: List[Tuple[str, str]] = []
+    dirs: Dict[str, int] = {}
+    for root, subdirs, names in os.walk(base_dir):
+        subdirs.sort()
+        rel_root = os.path.relpath(root, base_dir)
+        rel_root = '' if rel_root == os.curdir else rel_root.replace(os.sep, '/')
+        dirs[rel_root] = os.stat(root).st_mtime_ns
+        for fn in names:
+            stem, ext = os.path.splitext(fn)
+            ext = ext.lower()
+            if ext not in AUDIO_EXTENSIONS and ext not in TEXT_EXTS:
+                continue
+            rel = f"{rel_root}/{fn}" if rel_root else fn
+            entries.append((rel, normalize_track_name(stem)))
+    return entries, dirs
+
+
+def write_track_index(base_dir: str) -> bool:
+    """Write the sidecar index for ``base_dir``. Returns False when it could not be written."""
+    path = os.path.join(base_dir, TRACK_INDEX_FILENAME)
+    try:
+        with open(path, 'w', encoding='utf-8') as fh:
+            # Scanned after the sidecar exists: creating it is the top folder's
+            # last change, so the recorded mtimes describe exactly this listing
+            files, dirs = build_track_index(base_dir)
+            json.dump({'version': _TRACK_INDEX_VERSION, 'dirs': dirs, 'files': files}, fh, ensure_ascii=False)
+        return True
+    except OSError as exc:
+        logger.warning("Could not write track index for %s: %s", base_dir, exc)
+        return False
+
+
+def load_track_index(base_dir: str, dir_mtime_ns: int) -> Optional[TrackIndex]:
+    """Read the sidecar index, or return None when it is missing or stale.
+
+    Every folder's mtime is recorded, so files added or removed anywhere in
+    the tree (including new or deleted sub-folders, which change their
+    parent) invalidate it. ``dir_mtime_ns`` is the caller's stat of ``base_dir``.
+    """
+    path = os.path.join(base_dir, TRACK_INDEX_FILENAME)
+    try:
+        with open(path, 'r', encoding='utf-8') as fh:
+            payload = json.load(fh)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(payload, dict) or payload.get('version') != _TRACK_INDEX_VERSION:
+        return None
+    dirs = payload.get('dirs')
+    if not isinstance(dirs, dict) or dirs.get('') != dir_mtime_ns:
+        return None
+    try:
+        for rel_dir, mtime_ns in dirs.items():
+            if rel_dir and os.stat(os.path.join(base_dir, *rel_dir.split('/'))).st_mtime_ns != mtime_ns:
+                return None
+        files = [(str(rel), str(nb)) for rel, nb in payload.get('files') or ()]
+    except (OSError, TypeError, ValueError):
+        return None
+    return TrackIndex(files, len(dirs) > 1)
+
+
+__all__ = [
+    "TEXT_EXTS",
+    "TRACK_INDEX_FILENAME",
+    "TrackIndex",
+    "build_track_index",
+    "load_track_index",
+    "normalize_track_name",
+    "write_track_index",
+]
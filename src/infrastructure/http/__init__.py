@@ -0,0 +1,5 @@
+"""Shared HTTP transport helpers."""
+
+from .session import DEFAULT_POOL_MAXSIZE, build_session, get_shared_session, get_spotify_session
+
+__all__ = ["DEFAULT_POOL_MAXSIZE", "build_session", "get_shared_session", "get_spotify_session"]
@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+"""
+Pooled ``requests`` sessions shared by outbound HTTP clients.
+
+Spotipy creates a fresh ``requests.Session`` per client by default, so every
+rebuilt client (and every service holding its own client) re-does TCP/TLS
+handshakes against api.spotify.com. Handing all of them one pooled session
+keeps connections alive across calls.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from config import Config
+
+DEFAULT_POOL_MAXSIZE = Config.HTTP_POOL_MAXSIZE
+
+_spotify_session: Optional[requests.Session] = None
+_shared_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def build_session(*, pool_maxsize: int = DEFAULT_POOL_MAXSIZE, retries: Optional[Retry] = None) -> requests.Session:
+    """Return a new session with a keep-alive connection pool mounted for http(s).
+
+    ``pool_connections`` is the number of per-host pools kept; the sessions
+    here talk to a handful of hosts, so only ``pool_maxsize`` (connections
+    per host) needs to cover the concurrent fan-out.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=8,
+        pool_maxsize=pool_maxsize,
+        max_retries=retries if retries is not None else 0,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def _spotify_retry() -> Retry:
+    # Mirrors spotipy's own defaults; spotipy skips its retry adapter when a
+    # session is injected, so the policy has to live on ours instead.
+    return Retry(
+        total=3,
+        connect=None,
+        read=False,
+        allowed_methods=frozenset(["GET", "POST", "PUT", "DELETE"]),
+        status=3,
+        backoff_factor=0.3,
+        status_forcelist=(429, 500, 502, 503, 504),
+    )
+
+
+def get_spotify_session() -> requests.Session:
+    """Process-wide session used for Spotify Web API and token requests."""
+    global _spotify_session
+    if _spotify_session is None:
+        with _session_lock:
+            if _spotify_session is None:
+                _spotify_session = build_session(retries=_spotify_retry())
+    return _spotify_session
+
+
+def get_shared_session() -> requests.Session:
+    """Process-wide session for other outbound fetches (cover art, Genius)."""
+    global _shared_session
+    if _shared_session is None:
+        with _session_lock:
+            if _shared_session is None:
+                _shared_session = build_session(
+                    retries=Retry(
+                        total=3,
+                        backoff_factor=0.3,
+                        status_forcelist=(429, 500, 502, 503, 504),
+                        allowed_methods=frozenset(["GET", "HEAD"]),
+                    )
+                )
+    return _shared_session
+
+
+__all__ = ["DEFAULT_POOL_MAXSIZE", "build_session", "get_shared_session", "get_spotify_session"]
@@ -2,13 +2,13 @@
 """
 SpotDL client wrapper for reusable, programmatic downloads.
 
-Phase 2 goal: instantiate a single Spotdl client, allow per-job
-output template updates, enable lyrics providers (Genius) via
-settings, and expose a progress callback hook.
+Instantiate a single Spotdl client, allow per-job output template
+updates, enable lyrics providers (Genius) via settings, and expose a
+progress callback hook.
 
-This module does NOT change existing CLI-based download flow yet.
-It prepares the new API path while remaining idle until used by
-the orchestrator/routes in later phases.
+This is the only download path: spotDL runs in-process on a dedicated
+engine thread, so interpreter start-up, imports and the Spotify token
+are paid once per client rather than once per download.
 """
 
 from __future__ import annotations
@@ -20,6 +20,7 @@ from pathlib import Path
 import asyncio
 from queue import Queue
 import contextlib
+import importlib.util
 import io
 import os
 
@@ -29,6 +30,9 @@ from src.utils.cancellation import CancellationRequested
 
 logger = logging.getLogger(__name__)
 
+# Resolved once: whether the spotdl package can be imported in this interpreter
+SPOTDL_AVAILABLE = importlib.util.find_spec("spotdl") is not None
+
 
 class SpotdlClient:
     """Thin wrapper around spotdl.Spotdl with per-job helpers.
@@ -39,6 +43,9 @@ class SpotdlClient:
     - Leaves concurrency to SpotDL's internal thread pool ("threads" option)
     """
 
+    # Songs queued per cancellable chunk, as a multiple of SpotDL's thread count
+    COOPERATIVE_BATCH_DEPTH = 2
+
     def __init__(
         self,
         client_id: str,
@@ -342,13 +349,16 @@ class SpotdlClient:
             if cancel_event is None:
                 return _call_native(songs)
             # Cooperative mode with bounded-latency cancellation and parallelism:
-            # process in chunks roughly equal to the configured thread count so SpotDL
-            # downloads multiple songs in parallel, but we can stop between chunks.
+            # process in chunks of a few multiples of the thread count. Each chunk
+            # is a barrier (the next one starts only after its slowest song), so
+            # chunks sized exactly to the pool left most workers idle behind one
+            # straggler; a deeper chunk keeps SpotDL's pool busy while we can
+            # still stop between chunks.
             try:
                 threads = int(self._spotdl.downloader.settings.get('threads', 4))
             except Exception:
                 threads = 4
-            batch_size = max(1, min(threads, 16))
+            batch_size = max(1, min(threads * self.COOPERATIVE_BATCH_DEPTH, 32))
             # Defensive: ensure songs is a list we can slice
             song_list = list(songs or [])
             results: List[Tuple[Any, Optional[Path]]] = []
@@ -440,6 +450,9 @@ class SpotdlClient:
 
 def build_default_client(app_logger: Optional[logging.Logger] = None) -> SpotdlClient:
     """Build a SpotdlClient from environment/config defaults."""
+    if not SPOTDL_AVAILABLE:
+        # Fail before starting an engine thread that can only die on import
+        raise RuntimeError("spotdl is not installed in this environment. Install it with 'pip install spotdl'.")
     settings = load_app_settings()
     opts = build_spotdl_downloader_options(settings)
     if app_logger is not None:
@@ -0,0 +1,5 @@
+"""Spotify Web API client adapter."""
+
+from .client import get_spotify_client, prefetch_spotify_token
+
+__all__ = ["get_spotify_client", "prefetch_spotify_token"]
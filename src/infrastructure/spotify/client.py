@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+"""
+Process-level Spotipy clients keyed by credentials.
+
+The metadata service, the download orchestrator and the settings refresh path
+all need a client-credentials Spotipy instance. Building one per consumer means
+one OAuth token request per consumer; sharing them means one per credential
+pair for the life of the process.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from functools import lru_cache
+
+import spotipy
+from spotipy.oauth2 import SpotifyClientCredentials
+
+from src.infrastructure.http import get_spotify_session
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=4)
+def get_spotify_client(client_id: str, client_secret: str) -> spotipy.Spotify:
+    """Return the shared Spotipy client for the given credentials."""
+    session = get_spotify_session()
+    return spotipy.Spotify(
+        auth_manager=SpotifyClientCredentials(
+            client_id=client_id,
+            client_secret=client_secret,
+            requests_session=session,
+        ),
+        requests_session=session,
+    )
+
+
+def prefetch_spotify_token(client: spotipy.Spotify) -> None:
+    """Warm the client-credentials token in the background.
+
+    SpotifyClientCredentials fetches lazily on the first API call; doing it
+    at start-up keeps that round trip off the first user request.
+    """
+    auth_manager = getattr(client, "auth_manager", None)
+    if auth_manager is None:
+        return
+
+    def _fetch() -> None:
+        try:
+            auth_manager.get_access_token(as_dict=False)
+        except Exception as exc:
+            logger.debug("Spotify token prefetch failed: %s", exc)
+
+    threading.Thread(target=_fetch, name="spotify-token-prefetch", daemon=True).start()
+
+
+__all__ = ["get_spotify_client", "prefetch_spotify_token"]
@@ -0,0 +1,117 @@
+"""Shared response helpers for the HTTP blueprints."""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+from flask import Response, current_app
+from flask.json.provider import DefaultJSONProvider
+
+try:  # optional: C-backed encoder for the large catalogue payloads
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore
+
+
+def json_response(obj: Any, status: int = 200) -> Response:
+    """Serialize ``obj`` through the app's JSON provider (orjson when installed), like ``jsonify``."""
+    response = current_app.json.response(obj)
+    response.status_code = status
+    return response
+
+
+# Shared by the SSE endpoints; a tuple so no handler can mutate it in place
+SSE_HEADERS = (
+    ('Content-Type', 'text/event-stream'),
+    ('Cache-Control', 'no-cache, no-transform'),
+    ('Connection', 'keep-alive'),
+    ('X-Accel-Buffering', 'no'),
+)
+
+
+class OrjsonJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider that encodes with orjson when it is installed.
+
+    Output follows ``DefaultJSONProvider``: keys are sorted and dates, Decimals
+    and dataclasses go through its ``default`` hook. Pretty-printed output
+    (debug mode, explicit ``indent``) and values orjson rejects use the
+    stdlib encoder as before.
+    """
+
+    def _encode(self, obj: Any) -> Optional[bytes]:
+        if orjson is None:
+            return None
+        option = (
+            orjson.OPT_NON_STR_KEYS
+            | orjson.OPT_PASSTHROUGH_DATETIME
+            | orjson.OPT_PASSTHROUGH_DATACLASS
+        )
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        try:
+            return orjson.dumps(obj, default=self.default, option=option)
+        except TypeError:
+            return None
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if not kwargs.keys() - {'separators'}:
+            body = self._encode(obj)
+            if body is not None:
+                return body.decode('utf-8')
+        return super().dumps(obj, **kwargs)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            return super().response(*args, **kwargs)
+        body = self._encode(self._prepare_response_obj(args, kwargs))
+        if body is None:
+            return super().response(*args, **kwargs)
+        return self._app.response_class(body + b'\n', mimetype=self.mimetype)
+
+
+# Array items serialised per yielded chunk when streaming
+_STREAM_BATCH_SIZE = 64
+
+
+def _dumps(obj: Any) -> bytes:
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass
+    return json.dumps(obj).encode('utf-8')
+
+
+def streamed_json_response(
+    array_key: str,
+    items: Iterable[Any],
+    fields: Optional[Dict[str, Any]] = None,
+    status: int = 200,
+) -> Response:
+    """Stream ``{**fields, array_key: [*items]}`` as chunked JSON.
+
+    The array is serialised in small batches while the body is being sent,
+    so large track/album lists never exist as one encoded string.
+    """
+    head = _dumps(fields or {})[:-1]
+    prefix = head + (b',' if len(head) > 1 else b'') + _dumps(array_key) + b':['
+
+    def _generate() -> Iterator[bytes]:
+        yield prefix
+        batch = []
+        first = True
+        for item in items:
+            batch.append(_dumps(item))
+            if len(batch) >= _STREAM_BATCH_SIZE:
+                yield (b'' if first else b',') + b','.join(batch)
+                batch = []
+                first = False
+        if batch:
+            yield (b'' if first else b',') + b','.join(batch)
+        yield b']}'
+
+    return Response(_generate(), status=status, mimetype='application/json')
+
+
+__all__ = ["OrjsonJSONProvider", "SSE_HEADERS", "json_response", "streamed_json_response"]
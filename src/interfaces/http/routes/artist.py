@@ -1,7 +1,8 @@
 import logging
-from flask import Blueprint, request, jsonify, current_app
+from flask import Blueprint, request, current_app
 from flask_login import current_user, login_required
 
+from src.interfaces.http.responses import json_response, streamed_json_response
 from src.support.user_settings import ensure_user_api_keys_applied, user_has_spotify_credentials
 
 logger = logging.getLogger(__name__)
@@ -12,16 +13,43 @@ artist_bp = Blueprint('artist_bp', __name__, url_prefix='/api')
 def _ensure_spotify_ready():
     keys = ensure_user_api_keys_applied(current_user)
     if not user_has_spotify_credentials(keys):
-        return jsonify({"error": "Spotify credentials are not configured.", "code": "credentials_missing"}), 412
+        return json_response({"error": "Spotify credentials are not configured.", "code": "credentials_missing"}, 412)
     if not current_app.extensions.get("spotdl_ready", False):
-        return jsonify({"error": "The download engine is not ready yet.", "code": "spotdl_unavailable"}), 503
+        return json_response({"error": "The download engine is not ready yet.", "code": "spotdl_unavailable"}, 503)
+    # Browse endpoints talk to Spotipy through the orchestrator's client
+    if get_download_orchestrator().sp is None:
+        return json_response({"error": "Spotify API not initialized"}, 500)
     return None
 
 
 def get_download_orchestrator():
-    from flask import current_app
     return current_app.extensions['download_orchestrator']
 
+
+# Shared fallback for missing nested objects; only ever read from
+_EMPTY_DICT: dict = {}
+
+
+def _build_artist(artist):
+    """Shape one Spotify search result for the artist search response."""
+    get = artist.get
+    images = get('images') or ()
+    followers = (get('followers') or _EMPTY_DICT).get('total')
+    popularity = get('popularity')
+    followers_available = isinstance(followers, int)
+    popularity_available = isinstance(popularity, int)
+    return {
+        'id': get('id'),
+        'name': get('name'),
+        'genres': get('genres', []),
+        'followers': followers if followers_available else 0,
+        'popularity': popularity if popularity_available else 0,
+        'followers_available': followers_available,
+        'popularity_available': popularity_available,
+        'image': images[0]['url'] if images else None,
+        'external_urls': (get('external_urls') or _EMPTY_DICT).get('spotify'),
+    }
+
 @artist_bp.route('/search_artists', methods=['GET'])
 @login_required
 def search_artists_api():
@@ -33,7 +61,7 @@ def search_artists_api():
     query = request.args.get('q', '')
     if not query:
         # Keep response shape backward-compatible
-        return jsonify({"artists": []})
+        return json_response({"artists": []})
 
     # Server-driven pagination parameters
     try:
@@ -50,39 +78,16 @@ def search_artists_api():
     offset = (page - 1) * limit
 
     try:
-        sp = spotify_downloader.get_spotipy_instance()
-        if not sp:
-            return jsonify({"error": "Spotify API not initialized"}), 500
-
-        results = sp.search(q=query, type='artist', limit=limit, offset=offset)
-        artists = []
-        for artist in results.get('artists', {}).get('items', []):
-            images = artist.get('images') or []
-            followers_obj = (artist.get('followers') or {})
-            raw_followers = followers_obj.get('total')
-            raw_popularity = artist.get('popularity')
-            followers_available = isinstance(raw_followers, int)
-            popularity_available = isinstance(raw_popularity, int)
-            norm_followers = int(raw_followers) if isinstance(raw_followers, int) else 0
-            norm_popularity = int(raw_popularity) if isinstance(raw_popularity, int) else 0
-            artists.append({
-                'id': artist.get('id'),
-                'name': artist.get('name'),
-                'genres': artist.get('genres', []),
-                'followers': norm_followers,
-                'popularity': norm_popularity,
-                'followers_available': followers_available,
-                'popularity_available': popularity_available,
-                'image': images[0]['url'] if images else None,
-                'external_urls': (artist.get('external_urls') or {}).get('spotify'),
-            })
-
-        total_items = (results.get('artists') or {}).get('total', 0)
+        # Repeated searches (typing, paging back) are answered from the orchestrator cache
+        results = spotify_downloader.search_artists(query, limit=limit, offset=offset)
+        artists = [_build_artist(artist) for artist in results.get('items', [])]
+
+        total_items = results.get('total', 0)
         total_pages = max(1, (total_items + limit - 1) // max(1, limit)) if total_items else page
-        has_next = bool((results.get('artists') or {}).get('next'))
-        has_prev = bool((results.get('artists') or {}).get('previous'))
+        has_next = bool(results.get('next'))
+        has_prev = bool(results.get('previous'))
 
-        return jsonify({
+        response = json_response({
             "artists": artists,
             "pagination": {
                 "page": page,
@@ -93,9 +98,13 @@ def search_artists_api():
                 "has_prev": has_prev,
             }
         })
+        # Per-user (login required), so only the browser may reuse it
+        response.cache_control.private = True
+        response.cache_control.max_age = 60
+        return response
     except Exception as e:
         logger.error(f"Error searching artists: {e}", exc_info=True)
-        return jsonify({"error": "Failed to search artists"}), 500
+        return json_response({"error": "Failed to search artists"}, 500)
 
 @artist_bp.route('/famous_artists', methods=['GET'])
 @login_required
@@ -105,9 +114,6 @@ def get_popular_artists_api():
     if gate is not None:
         return gate
     spotify_downloader = get_download_orchestrator()
-    sp = spotify_downloader.get_spotipy_instance()
-    if not sp:
-        return jsonify({"error": "Spotify API not initialized"}), 500
 
     limit_param = request.args.get('limit')
     page_param = request.args.get('page')
@@ -134,22 +140,10 @@ def get_popular_artists_api():
     # Cap page size to a reasonable value
     page_size = min(page_size, 50)
     try:
-        # Use full cached pool to support flexible ordering, then slice
-        full_list = spotify_downloader.get_popular_artist_pool(market=market)
-        # Normalize metrics (defensive in case of legacy cache entries)
-        for a in full_list:
-            if a is None:
-                continue
-            pop = a.get('popularity')
-            fol = a.get('followers')
-            a['popularity_available'] = bool(a.get('popularity_available')) if 'popularity_available' in a else isinstance(pop, int)
-            a['followers_available'] = bool(a.get('followers_available')) if 'followers_available' in a else isinstance(fol, int)
-            a['popularity'] = int(pop) if isinstance(pop, int) else 0
-            a['followers'] = int(fol) if isinstance(fol, int) else 0
-
-        reverse = (order_dir == 'desc')
-        secondary = 'followers' if order_by == 'popularity' else 'popularity'
-        full_list.sort(key=lambda d: (d.get(order_by, 0) or 0, d.get(secondary, 0) or 0), reverse=reverse)
+        # Pool is normalised when built and each ordering is sorted once; just slice
+        full_list = spotify_downloader.get_sorted_popular_artist_pool(
+            market=market, order_by=order_by, order_dir=order_dir
+        )
 
         start = (page - 1) * page_size
         end = start + page_size
@@ -158,7 +152,7 @@ def get_popular_artists_api():
         has_prev = page > 1
         total_items = len(full_list)
         total_pages = max(1, (total_items + page_size - 1) // page_size)
-        return jsonify({
+        return json_response({
             "artists": artists,
             "pagination": {
                 "page": page,
@@ -171,7 +165,7 @@ def get_popular_artists_api():
         })
     except Exception as e:
         logger.error(f"General error fetching famous artists: {e}", exc_info=True)
-        return jsonify({"error": "Failed to retrieve famous artists"}), 500
+        return json_response({"error": "Failed to retrieve famous artists"}, 500)
 
 @artist_bp.route('/artist_details/<string:artist_id>', methods=['GET'])
 @login_required
@@ -181,18 +175,15 @@ def get_artist_details(artist_id):
     if gate is not None:
         return gate
     spotify_downloader = get_download_orchestrator()
-    sp = spotify_downloader.get_spotipy_instance()
-    if not sp:
-        return jsonify({"error": "Spotify API not initialized"}), 500
     try:
         details = spotify_downloader.fetch_artist_details(artist_id)
         if not details:
-            return jsonify({"message": "Artist not found"}), 404
+            return json_response({"message": "Artist not found"}, 404)
         logger.info(f"Fetched details for artist: {details['name']}")
-        return jsonify(details), 200
+        return json_response(details, 200)
     except Exception as e:
         logger.error(f"Error fetching artist details for ID {artist_id}: {e}", exc_info=True)
-        return jsonify({"error": "Failed to retrieve artist details"}), 500
+        return json_response({"error": "Failed to retrieve artist details"}, 500)
 
 @artist_bp.route('/artist_discography/<string:artist_id>', methods=['GET'])
 @login_required
@@ -202,14 +193,11 @@ def get_artist_discography(artist_id):
     if gate is not None:
         return gate
     spotify_downloader = get_download_orchestrator()
-    sp = spotify_downloader.get_spotipy_instance()
-    if not sp:
-        return jsonify({"error": "Spotify API not initialized"}), 500
     try:
         discography = spotify_downloader.fetch_artist_discography(artist_id)
         logger.info(f"Fetched discography for artist ID {artist_id}. Found {len(discography)} unique items.")
-        return jsonify({"discography": discography}), 200
+        return streamed_json_response("discography", discography)
     except Exception as e:
         logger.error(f"Error fetching artist discography for ID {artist_id}: {e}", exc_info=True)
-        return jsonify({"error": "Failed to retrieve artist discography"}), 500
+        return json_response({"error": "Failed to retrieve artist discography"}, 500)
 
@@ -3,7 +3,6 @@
 
 from __future__ import annotations
 
-import re
 from datetime import datetime
 from typing import Dict, Tuple
 
@@ -14,14 +13,41 @@ from src.database.db_manager import User, db
 
 
 auth_bp = Blueprint("auth", __name__, url_prefix="/api/auth")
-_EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+# Auth payloads are a few short fields; refuse anything larger before parsing
+_MAX_AUTH_BODY_BYTES = 64 * 1024
+
+
+@auth_bp.before_request
+def _reject_oversized_body():
+    if (request.content_length or 0) > _MAX_AUTH_BODY_BYTES:
+        return jsonify({"errors": {"form": "Request body too large."}}), 413
+    return None
+
+
+def _is_valid_email(value: str) -> bool:
+    """Accept ``local@domain.tld``-shaped addresses: one '@', a dot inside the domain, no whitespace.
+
+    Equivalent to ``^[^@\\s]+@[^@\\s]+\\.[^@\\s]+$`` but uses linear string scans, so a
+    long domain without a dot cannot make the check backtrack.
+    """
+    at = value.find("@")
+    if at <= 0 or "." not in value[at + 2:-1] or "@" in value[at + 1:]:
+        return False
+    # str.split() breaks on exactly the characters \s matches
+    parts = value.split()
+    return len(parts) == 1 and len(parts[0]) == len(value)
+
+
+def _email_in_use(email: str) -> bool:
+    # Existence check only: SELECT the primary key via the unique email index, not the whole row
+    return db.session.query(User.id).filter_by(email=email).first() is not None
 
 
 def _validate_credentials(payload: Dict[str, str]) -> Tuple[str, str, Dict[str, str]]:
     email = (payload.get("email") or "").strip().lower()
     password = (payload.get("password") or "").strip()
     errors: Dict[str, str] = {}
-    if not email or not _EMAIL_RE.match(email):
+    if not email or not _is_valid_email(email):
         errors["email"] = "Please provide a valid email address."
     if len(password) < 8:
         errors["password"] = "Password must be at least 8 characters long."
@@ -78,13 +104,12 @@ def _validate_profile_payload(payload: Dict[str, object]) -> Tuple[Dict[str, obj
 
 @auth_bp.route("/register", methods=["POST"])
 def register_user():
-    data = request.get_json() or {}
+    data = request.get_json(silent=True) or {}
     email, password, errors = _validate_credentials(data)
     if errors:
         return jsonify({"errors": errors}), 400
 
-    existing = User.query.filter_by(email=email).first()
-    if existing:
+    if _email_in_use(email):
         return jsonify({"errors": {"email": "An account with this email already exists."}}), 409
 
     user = User(email=email)
@@ -102,7 +127,7 @@ def register_user():
 
 @auth_bp.route("/login", methods=["POST"])
 def login():
-    data = request.get_json() or {}
+    data = request.get_json(silent=True) or {}
     email = (data.get("email") or "").strip().lower()
     password = (data.get("password") or "").strip()
 
@@ -139,7 +164,7 @@ def session_info():
 @auth_bp.route("/profile", methods=["PATCH"])
 @login_required
 def update_profile():
-    data = request.get_json() or {}
+    data = request.get_json(silent=True) or {}
     updates, errors = _validate_profile_payload(data)
 
     if errors:
@@ -155,12 +180,12 @@ def update_profile():
 @auth_bp.route("/change-email", methods=["POST"])
 @login_required
 def change_email():
-    data = request.get_json() or {}
+    data = request.get_json(silent=True) or {}
     new_email = (data.get("new_email") or "").strip().lower()
     current_password = (data.get("current_password") or "").strip()
 
     errors: Dict[str, str] = {}
-    if not new_email or not _EMAIL_RE.match(new_email):
+    if not new_email or not _is_valid_email(new_email):
         errors["new_email"] = "Please provide a valid email address."
     if not current_password:
         errors["current_password"] = "Your current password is required to change email."
@@ -174,8 +199,7 @@ def change_email():
     if new_email == current_user.email:
         return jsonify({"errors": {"new_email": "This email is already associated with your account."}}), 400
 
-    existing = User.query.filter(User.email == new_email).first()
-    if existing:
+    if _email_in_use(new_email):
         return jsonify({"errors": {"new_email": "Another account is already using this email."}}), 409
 
     current_user.email = new_email
@@ -189,7 +213,7 @@ def change_email():
 @auth_bp.route("/change-password", methods=["POST"])
 @login_required
 def change_password():
-    data = request.get_json() or {}
+    data = request.get_json(silent=True) or {}
     current_password = (data.get("current_password") or "").strip()
     new_password = (data.get("new_password") or "").strip()
     confirm_password = (data.get("confirm_password") or "").strip()
@@ -1,135 +1,79 @@
-﻿import logging
+﻿import base64
+import logging
 import os
 import threading
-from datetime import datetime
-from typing import Any, Dict, List
+import time
+from typing import Any, Dict
 
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, current_app, jsonify, request
 from flask_login import login_required
 
 from src.database.db_manager import db, DownloadedItem
 from src.support.identity import resolve_user_id
+from src.utils.placeholder_cover import render_placeholder_svg
 
 logger = logging.getLogger(__name__)
 
 compilation_bp = Blueprint('compilation_bp', __name__, url_prefix='/api')
 
+# 200 track references plus an optional base64 cover image fit well within this
+_MAX_COMPILATION_BODY_BYTES = 8 * 1024 * 1024
 
-def _get_downloader():
-    from flask import current_app
-    return current_app.extensions.get('download_orchestrator')
-
-
-def _resolve_user_id() -> int:
-    return resolve_user_id()
-
-
-@compilation_bp.route('/compilations/download', methods=['POST'])
-@login_required
-def download_compilation_api():
-    downloader = _get_downloader()
-    if downloader is None:
-        return jsonify({'status': 'error', 'message': 'Downloader unavailable'}), 503
-
-    data = request.get_json(silent=True) or {}
-    name = (data.get('name') or '').strip()
-    tracks = data.get('tracks') or []
-    cover_data_url = data.get('cover_data_url')  # optional base64 data URL from UI
-    async_mode = bool(data.get('async', True))
-
-    if not name:
-        return jsonify({'status': 'error', 'message': 'Missing compilation name'}), 400
-    if not isinstance(tracks, list) or len(tracks) == 0:
-        return jsonify({'status': 'error', 'message': 'Provide a non-empty list of tracks'}), 400
-    if len(tracks) > 200:
-        return jsonify({'status': 'error', 'message': 'Too many tracks (max 200)'}), 400
 
-    # Pre-create output dir and DB record so the item shows up in history immediately
-    safe_name = downloader.file_manager.sanitize_filename(name)
-    ts = datetime.now().strftime('%Y%m%d-%H%M')
-    comp_dir = os.path.join(downloader.base_output_dir, 'Compilations', f"{safe_name}-{ts}")
-    os.makedirs(comp_dir, exist_ok=True)
-    synthetic_spotify_id = f'comp-{ts}-{safe_name}'
-
-    # Try to save cover image immediately so the history grid can show it
-    def _save_data_url_image(data_url: str, out_dir: str) -> str | None:
+def _write_default_svg(title_text: str, out_dir: str) -> str | None:
+    try:
+        svg_path = os.path.join(out_dir, 'cover.svg')
+        with open(svg_path, 'w', encoding='utf-8') as f:
+            f.write(render_placeholder_svg((title_text or 'Compilation').strip()))
+        return svg_path
+    except Exception:
+        logger.exception('Failed to write default SVG cover')
+        return None
+
+
+# Cover image MIME types mapped to the saved file extension; other image types save as jpg
+_EXT_MAP = {'image/png': 'png', 'image/jpeg': 'jpg', 'image/jpg': 'jpg'}
+# Base64 characters decoded per write; a multiple of 4 so chunks decode independently
+_B64_CHUNK_CHARS = 64 * 1024
+
+
+def _save_data_url_image(data_url: str, out_dir: str) -> str | None:
+    if not isinstance(data_url, str) or not data_url.startswith('data:image/'):
+        return None
+    comma = data_url.find(',')
+    if comma < 0 or not data_url.endswith(';base64', 0, comma):
+        return None
+    mime = data_url[5:comma - 7].split(';', 1)[0].lower()
+    target = os.path.join(out_dir, f"cover.{_EXT_MAP.get(mime, 'jpg')}")
+    try:
+        fd = os.open(target, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o644)
         try:
-            if not isinstance(data_url, str) or not data_url.startswith('data:image/') or ';base64,' not in data_url:
-                return None
-            head, b64 = data_url.split(',', 1)
-            ext = 'jpg'
-            if 'image/png' in head:
-                ext = 'png'
-            elif 'image/jpeg' in head or 'image/jpg' in head:
-                ext = 'jpg'
-            fname = f'cover.{ext}'
-            target = os.path.join(out_dir, fname)
-            import base64
-            raw = base64.b64decode(b64)
-            with open(target, 'wb') as f:
-                f.write(raw)
-            return target
-        except Exception:
-            logger.exception('Failed to save data URL cover image')
-            return None
-
-    def _write_default_svg(title_text: str, out_dir: str) -> str | None:
+            for start in range(comma + 1, len(data_url), _B64_CHUNK_CHARS):
+                os.write(fd, base64.b64decode(data_url[start:start + _B64_CHUNK_CHARS], validate=True))
+        finally:
+            os.close(fd)
+        return target
+    except Exception:
+        logger.exception('Failed to save data URL cover image')
         try:
-            svg_path = os.path.join(out_dir, 'cover.svg')
-            # Simple centered SVG with wrapped text
-            safe_title = (title_text or 'Compilation').strip()
-            # naive wrap at ~24 chars
-            lines = []
-            line = ''
-            for word in safe_title.split():
-                if len(line) + len(word) + 1 <= 24:
-                    line = (line + ' ' + word).strip()
-                else:
-                    if line:
-                        lines.append(line)
-                    line = word
-            if line:
-                lines.append(line)
-            if len(lines) > 5:
-                lines = lines[:5]
-                lines[-1] += '…'
-            dy = 0
-            if lines:
-                # vertical offset so group is centered
-                total = (len(lines) - 1) * 1.3
-                dy = -total / 2.0
-            text_elems = '\n'.join([
-                f"<text x='50%' y='50%' dy='{(i*1.3)+dy}em' text-anchor='middle' dominant-baseline='middle' font-family='Segoe UI, Arial, sans-serif' font-size='36' fill='#0b1727'>{line}</text>"
-                for i, line in enumerate(lines)
-            ])
-            svg = f"""
-<svg xmlns='http://www.w3.org/2000/svg' width='640' height='640' viewBox='0 0 640 640'>
-  <defs>
-    <linearGradient id='bg' x1='0' y1='0' x2='1' y2='1'>
-      <stop offset='0%' stop-color='#a7c5eb'/>
-      <stop offset='100%' stop-color='#74b9ff'/>
-    </linearGradient>
-  </defs>
-  <rect width='100%' height='100%' fill='url(#bg)'/>
-  {text_elems}
-</svg>
-""".strip()
-            with open(svg_path, 'w', encoding='utf-8') as f:
-                f.write(svg)
-            return svg_path
-        except Exception:
-            logger.exception('Failed to write default SVG cover')
-            return None
+            os.remove(target)
+        except OSError:
+            pass
+        return None
+
 
+def _prepare_compilation_output(comp_dir: str, name: str, cover_data_url: Any) -> None:
+    """Create the compilation folder and its cover so the history grid can show it."""
+    os.makedirs(comp_dir, exist_ok=True)
     cover_path = None
     if isinstance(cover_data_url, str) and cover_data_url:
         cover_path = _save_data_url_image(cover_data_url, comp_dir)
     if not cover_path:
-        cover_path = _write_default_svg(name, comp_dir)
+        _write_default_svg(name, comp_dir)
 
-    user_id = _resolve_user_id()
 
-    # Persist or update DB record
+def _persist_compilation_item(synthetic_spotify_id: str, name: str, comp_dir: str, user_id: int) -> None:
+    """Create or refresh the history row for a compilation before its download runs."""
     try:
         existing = DownloadedItem.query.filter_by(spotify_id=synthetic_spotify_id, user_id=user_id).first()
         ownership_changed = False
@@ -172,17 +116,66 @@ def download_compilation_api():
         db.session.rollback()
         logger.warning('Failed to persist compilation item in DB early: %s', e, exc_info=True)
 
-    def _run_job():
-        try:
-            downloader.download_compilation(tracks, name, cover_data_url=cover_data_url, user_id=user_id)
-        except Exception as e:
-            logger.error('Compilation download failed: %s', e, exc_info=True)
+
+def _get_downloader():
+    return current_app.extensions.get('download_orchestrator')
+
+
+def _resolve_user_id() -> int:
+    return resolve_user_id()
+
+
+@compilation_bp.route('/compilations/download', methods=['POST'])
+@login_required
+def download_compilation_api():
+    downloader = _get_downloader()
+    if downloader is None:
+        return jsonify({'status': 'error', 'message': 'Downloader unavailable'}), 503
+
+    if (request.content_length or 0) > _MAX_COMPILATION_BODY_BYTES:
+        return jsonify({'status': 'error', 'message': 'Request body too large'}), 413
+
+    data = request.get_json(silent=True) or {}
+    name = (data.get('name') or '').strip()
+    tracks = data.get('tracks') or []
+    cover_data_url = data.get('cover_data_url')  # optional base64 data URL from UI
+    async_mode = bool(data.get('async', True))
+
+    if not name:
+        return jsonify({'status': 'error', 'message': 'Missing compilation name'}), 400
+    if not isinstance(tracks, list) or len(tracks) == 0:
+        return jsonify({'status': 'error', 'message': 'Provide a non-empty list of tracks'}), 400
+    if len(tracks) > 200:
+        return jsonify({'status': 'error', 'message': 'Too many tracks (max 200)'}), 400
+
+    safe_name = downloader.file_manager.sanitize_filename(name)
+    lt = time.localtime()
+    ts = '%04d%02d%02d-%02d%02d' % (lt.tm_year, lt.tm_mon, lt.tm_mday, lt.tm_hour, lt.tm_min)
+    comp_dir = os.path.join(downloader.base_output_dir, 'Compilations', f"{safe_name}-{ts}")
+    synthetic_spotify_id = f'comp-{ts}-{safe_name}'
+    user_id = _resolve_user_id()
 
     if async_mode:
+        app = current_app._get_current_object()
+
+        def _run_job():
+            # Folder, cover and history row are written here rather than before
+            # the 202, so the response does not wait on disk or DB commits
+            with app.app_context():
+                try:
+                    _prepare_compilation_output(comp_dir, name, cover_data_url)
+                    _persist_compilation_item(synthetic_spotify_id, name, comp_dir, user_id)
+                    downloader.download_compilation(tracks, name, cover_data_url=cover_data_url, user_id=user_id)
+                except Exception as e:
+                    logger.error('Compilation download failed: %s', e, exc_info=True)
+
         t = threading.Thread(target=_run_job, name=f'compilation-{ts}', daemon=True)
         t.start()
         return jsonify({'status': 'accepted', 'compilation_spotify_id': synthetic_spotify_id, 'output_directory': comp_dir}), 202
 
+    # Pre-create output dir and DB record so the item shows up in history immediately
+    _prepare_compilation_output(comp_dir, name, cover_data_url)
+    _persist_compilation_item(synthetic_spotify_id, name, comp_dir, user_id)
     result = downloader.download_compilation(tracks, name, cover_data_url=cover_data_url, user_id=user_id)
     http_status = 200 if isinstance(result, dict) and result.get('status') == 'success' else 500
     return jsonify(result), http_status
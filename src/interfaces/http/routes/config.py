@@ -1,21 +1,39 @@
+import hashlib
+import json
 import logging
-from flask import Blueprint, jsonify
+from functools import lru_cache
+
+from flask import Blueprint, Response, request
 from config import Config
 
 logger = logging.getLogger(__name__)
 
 config_bp = Blueprint('config_bp', __name__, url_prefix='/api')
 
+# Values come from process configuration, so browsers may reuse them briefly
+_FRONTEND_CONFIG_MAX_AGE = 300
 
-@config_bp.route('/config/frontend', methods=['GET'])
-def get_frontend_config():
-    """Expose a minimal set of configuration values to the frontend."""
+
+@lru_cache(maxsize=1)
+def _frontend_config_body() -> bytes:
+    """Serialize the frontend config once; its source values never change at runtime."""
     try:
         payload = {
             'cd_capacity_minutes': int(Config.CD_CAPACITY_MINUTES or 80),
         }
-        return jsonify(payload), 200
     except Exception as e:
         logger.warning('Failed to load frontend config: %s', e, exc_info=True)
-        return jsonify({'cd_capacity_minutes': 80}), 200
+        payload = {'cd_capacity_minutes': 80}
+    return json.dumps(payload).encode('utf-8')
 
+
+@config_bp.route('/config/frontend', methods=['GET'])
+def get_frontend_config():
+    """Expose a minimal set of configuration values to the frontend."""
+    body = _frontend_config_body()
+    response = Response(body, status=200, mimetype='application/json')
+    response.set_etag(hashlib.md5(body).hexdigest())
+    response.cache_control.public = True
+    response.cache_control.max_age = _FRONTEND_CONFIG_MAX_AGE
+    # Answers If-None-Match with an empty 304
+    return response.make_conditional(request)
@@ -1,22 +1,248 @@
+import hashlib
 import os
 import shutil
 import logging
-from flask import Blueprint, request, jsonify, send_file
-import json
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, wraps
+from queue import Empty
+from urllib.parse import quote
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+from flask import Blueprint, Response, request, jsonify, send_file
 from flask_login import current_user, login_required
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import load_only
+from config import Config
+from src.core import heartbeat_frame, sse_frame
 from src.database.db_manager import db, DownloadedItem
 from src.domain.catalog import LyricsService
-import re
+from src.interfaces.http.responses import SSE_HEADERS
 
 from src.domain.downloads.history_service import persist_download_item
+from src.domain.downloads.file_manager import AUDIO_EXTENSIONS as _AUDIO_EXTS
+from src.domain.downloads.track_index import (
+    TEXT_EXTS as _TEXT_EXTS,
+    load_track_index,
+    normalize_track_name as _norm,
+)
 from src.support.identity import resolve_user_id
-from src.support.user_settings import ensure_user_api_keys_applied_for_user_id, user_has_spotify_credentials
+from src.utils.filenames import sanitize_filename
+from src.utils.placeholder_cover import render_placeholder_svg
+from src.support.user_settings import ensure_user_api_keys_applied, user_has_spotify_credentials
 
 
 logger = logging.getLogger(__name__)
 
 download_bp = Blueprint('download_bp', __name__, url_prefix='/api')
 
+_FEAT_PREFIXES = ('feat', 'featuring', 'ft', 'with')
+
+
+class _ItemDirIndex(NamedTuple):
+    """Audio and lyrics files of one item folder, keyed for track lookups."""
+
+    by_name: Dict[str, str]  # lowercased file name -> path
+    audio: Tuple[Tuple[str, str], ...]  # (path, normalized stem)
+    audio_by_norm: Dict[str, str]
+    text: Tuple[Tuple[str, str], ...]
+    text_by_norm: Dict[str, str]
+    has_subdirs: bool
+
+
+def _build_item_index(files: List[Tuple[str, str, Optional[str]]], has_subdirs: bool) -> _ItemDirIndex:
+    """Key ``(path, file name, normalized stem or None)`` triples for track lookups.
+
+    The first file in listing order wins when several share a name or
+    normalized stem.
+    """
+    by_name: Dict[str, str] = {}
+    audio: List[Tuple[str, str]] = []
+    audio_by_norm: Dict[str, str] = {}
+    text: List[Tuple[str, str]] = []
+    text_by_norm: Dict[str, str] = {}
+    for path, fn, nb in files:
+        stem, ext = os.path.splitext(fn)
+        ext = ext.lower()
+        if ext in _AUDIO_EXTS:
+            entries, by_norm = audio, audio_by_norm
+        elif ext in _TEXT_EXTS:
+            entries, by_norm = text, text_by_norm
+        else:
+            continue
+        if nb is None:
+            nb = _norm(stem)
+        by_name.setdefault(fn.lower(), path)
+        entries.append((path, nb))
+        by_norm.setdefault(nb, path)
+    return _ItemDirIndex(by_name, tuple(audio), audio_by_norm, tuple(text), text_by_norm, has_subdirs)
+
+
+@lru_cache(maxsize=256)
+def _index_item_dir(base_dir: str, mtime_ns: int) -> _ItemDirIndex:
+    """Index the audio and lyrics files directly inside ``base_dir``.
+
+    ``mtime_ns`` is only part of the cache key: adding or removing files in the
+    folder changes it, so a stale listing is never reused. It says nothing
+    about nested folders, which is why only the flat listing is cached.
+    """
+    files: List[Tuple[str, str, Optional[str]]] = []
+    # Downloads leave a sidecar with the names already normalized; older
+    # folders (or ones changed since) are listed and normalized here instead
+    indexed = load_track_index(base_dir, mtime_ns)
+    if indexed is not None:
+        files = [(os.path.join(base_dir, rel), rel, nb) for rel, nb in indexed.files if '/' not in rel]
+        return _build_item_index(files, indexed.has_subdirs)
+    # Item folders are normally flat: one scandir pass, no per-directory walk
+    has_subdirs = False
+    with os.scandir(base_dir) as it:
+        for entry in it:
+            if entry.is_file():
+                files.append((entry.path, entry.name, None))
+            elif entry.is_dir(follow_symlinks=False):
+                has_subdirs = True
+    return _build_item_index(files, has_subdirs)
+
+
+def _index_item_tree(base_dir: str, mtime_ns: int) -> _ItemDirIndex:
+    """Index every audio and lyrics file below ``base_dir``; never cached.
+
+    spotDL may write into sub-folders, whose changes leave the top folder's
+    mtime untouched, so there is no cheap key to cache this listing under.
+    A sidecar is only used after all of its recorded folder mtimes check out.
+    """
+    indexed = load_track_index(base_dir, mtime_ns)
+    if indexed is not None:
+        files = [
+            (os.path.join(base_dir, *rel.split('/')), rel.rsplit('/', 1)[-1], nb)
+            for rel, nb in indexed.files
+        ]
+    else:
+        files = [(os.path.join(root, fn), fn, None) for root, _, names in os.walk(base_dir) for fn in names]
+    return _build_item_index(files, True)
+
+
+def _exact_track_file(index: _ItemDirIndex, artist: str, sanitized_title: str) -> Optional[str]:
+    """Match the file names SpotDL writes: "<title>.mp3" or "<artist> - <title>.mp3"."""
+    found = index.by_name.get(f"{sanitized_title}.mp3".lower())
+    if not found and artist:
+        found = index.by_name.get(f"{artist} - {sanitized_title}.mp3".lower())
+    return found
+
+
+def _match_track_file(
+    entries: Tuple[Tuple[str, str], ...],
+    by_norm: Dict[str, str],
+    title: str,
+    artist: str,
+    sanitized_title: str,
+) -> Optional[str]:
+    """Fuzzy-match a track among ``entries`` using the burn preview rules.
+
+    Exact normalized names are dictionary lookups; only the featuring and
+    extra-artist variants need a scan.
+    """
+    exp1 = _norm(sanitized_title)
+    exp2 = _norm(f"{artist} - {sanitized_title}") if artist else None
+    exp3 = _norm(title)
+    exp4 = _norm(f"{artist} - {title}") if artist else None
+    for exp in (exp1, exp2, exp3, exp4):
+        if exp and exp in by_norm:
+            return by_norm[exp]
+
+    artist_norm = _norm(artist) if artist else ''
+    tail1 = '-' + exp1 if exp1 else None
+    tail3 = '-' + exp3 if exp3 else None
+    for path, nb in entries:
+        # Handle trailing feat*
+        if exp1 and nb.startswith(exp1) and nb[len(exp1):].startswith(_FEAT_PREFIXES):
+            return path
+        if exp2 and nb.startswith(exp2) and nb[len(exp2):].startswith(_FEAT_PREFIXES):
+            return path
+        # Accept extra artists before the hyphen
+        if tail1 and nb.endswith(tail1):
+            if not artist_norm or nb[: -len(tail1)].startswith(artist_norm):
+                return path
+        if tail3 and nb.endswith(tail3):
+            if not artist_norm or nb[: -len(tail3)].startswith(artist_norm):
+                return path
+    return None
+
+
+def _find_lyrics_file(index: _ItemDirIndex, title: str, artist: str, sanitized_title: str) -> Optional[str]:
+    return _match_track_file(index.text, index.text_by_norm, title, artist, sanitized_title)
+
+
+def _find_audio_file(index: _ItemDirIndex, title: str, artist: str, sanitized_title: str) -> Optional[str]:
+    # Exact filename match first, then fuzzy-normalized across all audio files
+    return _exact_track_file(index, artist, sanitized_title) or _match_track_file(
+        index.audio, index.audio_by_norm, title, artist, sanitized_title
+    )
+
+
+def _search_item_dir(
+    base_dir: str,
+    find: Callable[[_ItemDirIndex, str, str, str], Optional[str]],
+    title: str,
+    artist: str,
+    sanitized_title: str,
+) -> Optional[str]:
+    """Run ``find`` over the folder's own files, then over nested folders on a miss.
+
+    The flat listing is cached per folder until its contents change; the
+    nested walk only runs when the flat pass finds nothing.
+    """
+    mtime_ns = os.stat(base_dir).st_mtime_ns
+    index = _index_item_dir(base_dir, mtime_ns)
+    found = find(index, title, artist, sanitized_title)
+    if found is None and index.has_subdirs:
+        found = find(_index_item_tree(base_dir, mtime_ns), title, artist, sanitized_title)
+    return found
+
+# Columns the item endpoints read; the rest of the row is left unloaded
+_ITEM_COLUMNS = load_only(
+    DownloadedItem.user_id,
+    DownloadedItem.local_path,
+    DownloadedItem.title,
+    DownloadedItem.item_type,
+    DownloadedItem.spotify_id,
+)
+
+
+def _get_item(item_id: int) -> Optional[DownloadedItem]:
+    return db.session.get(DownloadedItem, item_id, options=[_ITEM_COLUMNS])
+
+
+def owned_item(arg: str = 'item_id'):
+    """Load the DownloadedItem named by the ``arg`` URL parameter and check ownership.
+
+    Unknown ids get a 404 and other users' items a 403; otherwise the view is
+    called with the loaded row as ``item``.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            item = _get_item(kwargs[arg])
+            if not item:
+                return jsonify({'success': False, 'error': 'Item not found', 'message': 'Item not found'}), 404
+            if item.user_id != _resolve_user_id():
+                return jsonify({'success': False, 'error': 'Not authorized', 'message': 'Not authorized'}), 403
+            return view(*args, item=item, **kwargs)
+        return wrapper
+    return decorator
+
+
+# Deleted item folders are removed one at a time in the background
+_trash_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='trash-cleanup')
+
+
+def _remove_trashed_dir(path: str) -> None:
+    try:
+        shutil.rmtree(path)
+    except Exception:
+        logger.exception("Failed to remove deleted item folder %s", path)
+
+
 def _persist_download_item(result: dict) -> None:
     """Persist DownloadedItem metadata for completed downloads (idempotent)."""
     persist_download_item(result)
@@ -38,14 +264,69 @@ def get_progress_broker():
     from flask import current_app
     return current_app.extensions.get('progress_broker')
 
+
+# Progress events buffered per streaming client; a slow reader loses the oldest
+_JOB_STREAM_QUEUE_SIZE = 256
+_JOB_STREAM_HEARTBEAT_SECONDS = 15
+
+
+def _job_event_stream(broker, sid: int, events, job) -> Iterator[bytes]:
+    """Relay progress events until ``job`` finishes, then report its result."""
+    try:
+        yield sse_frame({'event': 'job_accepted', 'job_id': job.id, 'link': job.link, 'status': job.status})
+        last_beat = time.time()
+        # Once the job is done, only drain what was already buffered (at most
+        # one full buffer, so other downloads' traffic cannot keep us open)
+        drain_left = _JOB_STREAM_QUEUE_SIZE
+        while True:
+            finished = job.event.is_set()
+            if finished:
+                if drain_left <= 0:
+                    break
+                drain_left -= 1
+            try:
+                ev, frame = events.get(timeout=0 if finished else 1.0)
+            except Empty:
+                if finished:
+                    break
+                if job.event.is_set():
+                    continue
+                now = time.time()
+                if now - last_beat >= _JOB_STREAM_HEARTBEAT_SECONDS:
+                    last_beat = now
+                    yield heartbeat_frame(now)
+                continue
+            # The broker carries every download; the job queue tags ours with job_id
+            if ev.get('job_id') == job.id:
+                # Already encoded once by the broker for all subscribers
+                yield frame
+        yield sse_frame({
+            'event': 'job_finished',
+            'job_id': job.id,
+            'link': job.link,
+            'status': job.status,
+            'result': job.result,
+        })
+    finally:
+        broker.close_queue(sid)
+
+
 @download_bp.route('/download', methods=['POST'])
 @login_required
 def download_spotify_item_api():
+    """Start a download for a Spotify link.
+
+    Payload: { "spotify_link": str, "async": bool, "stream": bool, "force": bool }
+    With ``stream`` the response is an SSE stream of the job's progress that
+    ends with a ``job_finished`` event carrying the result.
+    """
     from flask import current_app
     spotify_downloader = get_download_orchestrator()
     jobs = get_job_queue()
 
-    keys = ensure_user_api_keys_applied_for_user_id(current_user.id, refresh_client=False)
+    # current_user is already loaded by Flask-Login; reusing it avoids a second user
+    # lookup, and applying keys is a no-op while the same user's keys are active
+    keys = ensure_user_api_keys_applied(current_user, refresh_client=False)
     if not user_has_spotify_credentials(keys):
         return jsonify({
             "status": "error",
@@ -62,6 +343,7 @@ def download_spotify_item_api():
     data = request.get_json() or {}
     spotify_link = data.get('spotify_link')
     async_mode = bool(data.get('async', False))
+    stream_mode = bool(data.get('stream', False))
     force_mode = bool(data.get('force', False))
 
     if not spotify_link:
@@ -69,22 +351,33 @@ def download_spotify_item_api():
 
     logger.info(f"Received download request for: {spotify_link} (async={async_mode})")
 
+    user_id = _resolve_user_id()
+    broker = get_progress_broker() if stream_mode else None
     # If job queue is available, use it for idempotent handling and parallelism
-    if jobs is not None and async_mode and force_mode:
+    if jobs is not None and (async_mode or broker is not None) and force_mode:
         # Cancel any active job for this user before starting a new one
         try:
-            jobs.cancel_active_for_user(user_id=_resolve_user_id())
+            jobs.cancel_active_for_user(user_id=user_id)
         except Exception:
             pass
     if jobs is not None:
-        job = jobs.submit(spotify_link, user_id=_resolve_user_id())
+        if broker is not None:
+            # Subscribe before submitting so the job's first events are not missed
+            sid, events = broker.open_queue(maxsize=_JOB_STREAM_QUEUE_SIZE)
+            try:
+                job = jobs.submit(spotify_link, user_id=user_id)
+            except Exception:
+                broker.close_queue(sid)
+                raise
+            return Response(_job_event_stream(broker, sid, events, job), headers=SSE_HEADERS)
+        job = jobs.submit(spotify_link, user_id=user_id)
         if async_mode:
             return jsonify({"status": "accepted", "job_id": job.id, "link": spotify_link}), 202
         # Synchronous path: wait for completion
         result = jobs.wait(job.id)
     else:
         # Direct call when no job queue is configured
-        result = spotify_downloader.download_spotify_content(spotify_link, user_id=_resolve_user_id())
+        result = spotify_downloader.download_spotify_content(spotify_link, user_id=user_id)
 
     if not isinstance(result, dict):
         return jsonify({"status": "error", "message": "Unexpected orchestrator response."}), 500
@@ -146,7 +439,7 @@ def cancel_download_job():
 
     # Push an immediate SSE event so the UI can react instantly
     broker = get_progress_broker()
-    if broker is not None:
+    if broker is not None and broker.has_subscribers():
         try:
             broker.publish({
                 'event': 'job_cancel_requested',
@@ -163,7 +456,10 @@ def cancel_download_job():
 @download_bp.route('/download/jobs/<string:job_id>', methods=['GET'])
 @login_required
 def get_job_status(job_id: str):
-    """Return current status for a job in the JobQueue."""
+    """Return current status for a job in the JobQueue.
+
+    Read-only: the queue worker persists the DownloadedItem when the job completes.
+    """
     jobs = get_job_queue()
     if jobs is None:
         return jsonify({"status": "error", "message": "Job queue unavailable."}), 503
@@ -180,60 +476,90 @@ def get_job_status(job_id: str):
         "result": job.result,
         "error": job.error,
     }
-    if job.status == "completed" and isinstance(job.result, dict) and job.result.get("status") == "success":
-        _persist_download_item(job.result)
     return jsonify(payload), 200
 
+_ITEMS_PAGE_DEFAULT = 200
+_ITEMS_PAGE_MAX = 1000
+
 @download_bp.route('/albums', methods=['GET'])
 @login_required
 def get_downloaded_items():
+    """List the user's downloaded items ordered by title.
+
+    Optional keyset pagination: ``limit`` (default 200, max 1000) plus
+    ``after_title``/``after_id`` taken from the last item of the previous page.
+    Without ``limit`` the full library is returned.
+    """
     user_id = _resolve_user_id()
-    items = DownloadedItem.query.filter_by(user_id=user_id).order_by(DownloadedItem.title).all()
+    query = DownloadedItem.query.filter_by(user_id=user_id)
+    order = (DownloadedItem.title, DownloadedItem.id)
+    if 'limit' not in request.args:
+        items = query.order_by(*order).all()
+        return jsonify([item.to_dict() for item in items]), 200
+
+    try:
+        limit = int(request.args.get('limit', _ITEMS_PAGE_DEFAULT))
+    except ValueError:
+        limit = _ITEMS_PAGE_DEFAULT
+    limit = min(max(1, limit), _ITEMS_PAGE_MAX)
+    after_title = request.args.get('after_title')
+    if after_title is not None:
+        after_id = request.args.get('after_id', 0, type=int)
+        query = query.filter(or_(
+            DownloadedItem.title > after_title,
+            and_(DownloadedItem.title == after_title, DownloadedItem.id > after_id),
+        ))
+    items = query.order_by(*order).limit(limit).all()
     return jsonify([item.to_dict() for item in items]), 200
 
 @download_bp.route('/albums/<int:item_id>', methods=['DELETE'])
 @login_required
-def delete_downloaded_item(item_id):
-    item = DownloadedItem.query.get(item_id)
-    if not item:
-        return jsonify({'success': False, 'message': 'Item not found'}), 404
-
-    if item.user_id != _resolve_user_id():
-        return jsonify({'success': False, 'message': 'Not authorized to delete this item'}), 403
-
+@owned_item()
+def delete_downloaded_item(item_id, item):
+    # Move the folder aside (a single rename) and remove it off the request thread
+    trash_path = None
     if item.local_path and os.path.exists(item.local_path):
+        trash_path = f"{os.path.normpath(item.local_path)}.trash-{uuid.uuid4().hex}"
         try:
-            shutil.rmtree(item.local_path)
-            logger.info(f"Successfully deleted local directory for {item.item_type}: {item.title} at {item.local_path}")
+            os.rename(item.local_path, trash_path)
         except Exception as e:
             logger.error(f"Failed to delete local directory {item.local_path} for {item.title}: {e}", exc_info=True)
             return jsonify({'success': False, 'message': f'Failed to delete local files: {str(e)}'}), 500
 
-    db.session.delete(item)
-    db.session.commit()
+    try:
+        db.session.delete(item)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        if trash_path:
+            # Put the files back so the surviving row still points at them
+            try:
+                os.rename(trash_path, item.local_path)
+            except Exception:
+                logger.exception("Failed to restore %s after a failed delete", item.local_path)
+        raise
+    if trash_path:
+        _trash_pool.submit(_remove_trashed_dir, trash_path)
+        logger.info(f"Scheduled removal of local directory for {item.item_type}: {item.title} at {item.local_path}")
     logger.info(f"Successfully deleted {item.item_type} '{item.title}' from DB.")
     return jsonify({'success': True, 'message': 'Item deleted successfully.'}), 200
 
 
 @download_bp.route('/items/<int:item_id>/metadata', methods=['GET'])
 @login_required
-def get_item_metadata_by_id(item_id: int):
+@owned_item()
+def get_item_metadata_by_id(item_id: int, item):
     """Return the saved spotify_metadata.json for a downloaded item by DB id."""
-    item = DownloadedItem.query.get(item_id)
-    if not item:
-        return jsonify({'error': 'Item not found'}), 404
-    if item.user_id != _resolve_user_id():
-        return jsonify({'error': 'Not authorized'}), 403
     if not item.local_path:
         return jsonify({'error': 'Local path not available for this item'}), 404
 
     metadata_path = os.path.join(item.local_path, 'spotify_metadata.json')
-    if not os.path.exists(metadata_path):
-        return jsonify({'error': 'Metadata not found'}), 404
     try:
-        with open(metadata_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        return jsonify(data), 200
+        # The file is already JSON: serve it as-is, with 304s for unchanged copies.
+        # send_file stats the path itself, so a missing file surfaces here.
+        return send_file(metadata_path, mimetype='application/json', conditional=True)
+    except (FileNotFoundError, NotADirectoryError):
+        return jsonify({'error': 'Metadata not found'}), 404
     except Exception as e:
         logger.error("Failed to read metadata for item %s: %s", item_id, e, exc_info=True)
         return jsonify({'error': 'Failed to read metadata'}), 500
@@ -250,20 +576,27 @@ def get_item_metadata_by_spotify(spotify_id: str):
         return jsonify({'error': 'Local path not available for this item'}), 404
 
     metadata_path = os.path.join(item.local_path, 'spotify_metadata.json')
-    if not os.path.exists(metadata_path):
-        return jsonify({'error': 'Metadata not found'}), 404
     try:
-        with open(metadata_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        return jsonify(data), 200
+        # The file is already JSON: serve it as-is, with 304s for unchanged copies.
+        # send_file stats the path itself, so a missing file surfaces here.
+        return send_file(metadata_path, mimetype='application/json', conditional=True)
+    except (FileNotFoundError, NotADirectoryError):
+        return jsonify({'error': 'Metadata not found'}), 404
     except Exception as e:
         logger.error("Failed to read metadata for spotify %s: %s", spotify_id, e, exc_info=True)
         return jsonify({'error': 'Failed to read metadata'}), 500
 
 
+@lru_cache(maxsize=1)
+def _lyrics_service() -> LyricsService:
+    """Shared LyricsService for embedded-lyrics reads; it holds no per-request state."""
+    return LyricsService()
+
+
 @download_bp.route('/items/<int:item_id>/lyrics', methods=['GET'])
 @login_required
-def get_item_lyrics(item_id: int):
+@owned_item()
+def get_item_lyrics(item_id: int, item):
     """Retrieve lyrics for a given downloaded item (album/playlist/track) using fuzzy file matching.
 
     Query params:
@@ -271,144 +604,32 @@ def get_item_lyrics(item_id: int):
       - artist: primary artist name (optional but recommended)
 
     Strategy:
-      1) Find the matching audio file in the item's folder using the same fuzzy rules used for burn preview.
-      2) Prefer a .txt lyrics file with the same basename as the audio file (exported by SpotDL pipeline).
-      3) If no .txt found, read embedded lyrics from the audio file via LyricsService.
-      4) If still not found, attempt fuzzy match among .txt basenames.
+      1) Look for a .txt lyrics file (exported by SpotDL pipeline) using the same fuzzy rules used for burn preview.
+      2) If no .txt found, find the matching audio file in the item's folder the same way.
+      3) Read embedded lyrics from the audio file via LyricsService.
+
+    ``matched_audio_path`` is only set when the audio file had to be consulted.
     """
     title = (request.args.get('title') or '').strip()
     artist = (request.args.get('artist') or '').strip()
     if not title:
         return jsonify({'error': 'Missing title parameter'}), 400
 
-    item = DownloadedItem.query.get(item_id)
-    if not item:
-        return jsonify({'error': 'Item not found'}), 404
     base_dir = item.local_path
-    if not base_dir or not os.path.isdir(base_dir):
+    if not base_dir:
         return jsonify({'error': 'Associated content directory not found or is invalid.'}), 404
 
-    # Gather candidate files
-    audio_exts = ('.mp3', '.flac', '.m4a', '.ogg', '.wav')
-    text_exts = ('.txt',)
-    all_files = []
-    for root, _, files in os.walk(base_dir):
-        for fn in files:
-            low = fn.lower()
-            if low.endswith(audio_exts) or low.endswith(text_exts):
-                all_files.append(os.path.join(root, fn))
-
-    # Normalization helper (mirrors cd_burning_service)
-    def _norm(s: str) -> str:
-        s = (s or '').lower()
-        s = s.replace('\ufffdT', "'")  # best-effort for odd apostrophes
-        s = re.sub(r"[\\/:*?\"<>|.,!()\[\]{}]", '', s)
-        s = s.replace('_', '')
-        s = re.sub(r"\s+", '', s)
-        return s
-
-    # Build expectations
-    sanitized_title = re.sub(r'[\\/:*?"<>|]', '_', title).strip()
-    sanitized_title = re.sub(r'_{2,}', '_', sanitized_title)
-
-    # 1) Try exact filename match for audio
-    found_audio = None
-    mp3_name = f"{sanitized_title}.mp3"
-    fallback_name = f"{artist} - {sanitized_title}.mp3" if artist else None
-    for path in all_files:
-        base = os.path.basename(path)
-        if base.lower() == mp3_name.lower():
-            found_audio = path
-            break
-    if not found_audio and artist:
-        for path in all_files:
-            base = os.path.basename(path)
-            if base.lower() == (fallback_name or '').lower():
-                found_audio = path
-                break
-
-    # 2) Fuzzy-normalized across all audio files
-    if not found_audio:
-        exp1 = _norm(sanitized_title)
-        exp2 = _norm(f"{artist} - {sanitized_title}") if artist else None
-        exp3 = _norm(title)
-        exp4 = _norm(f"{artist} - {title}") if artist else None
-        artist_norm = _norm(artist) if artist else ''
-        for path in all_files:
-            if not path.lower().endswith(audio_exts):
-                continue
-            base_no_ext = os.path.splitext(os.path.basename(path))[0]
-            nb = _norm(base_no_ext)
-            if nb in filter(None, (exp1, exp2, exp3, exp4)):
-                found_audio = path
-                break
-            # Handle trailing feat*
-            if exp1 and nb.startswith(exp1) and nb[len(exp1):].startswith(('feat', 'featuring', 'ft', 'with')):
-                found_audio = path
-                break
-            if exp2 and nb.startswith(exp2) and nb[len(exp2):].startswith(('feat', 'featuring', 'ft', 'with')):
-                found_audio = path
-                break
-            # Accept extra artists before the hyphen
-            tail1 = '-' + exp1 if exp1 else None
-            tail3 = '-' + exp3 if exp3 else None
-            if tail1 and nb.endswith(tail1):
-                left = nb[: -len(tail1)]
-                if not artist_norm or left.startswith(artist_norm):
-                    found_audio = path
-                    break
-            if tail3 and nb.endswith(tail3):
-                left = nb[: -len(tail3)]
-                if not artist_norm or left.startswith(artist_norm):
-                    found_audio = path
-                    break
-
-    # Try matching a .txt with same base as the audio
-    matched_txt = None
-    if found_audio:
-        base_no_ext = os.path.splitext(found_audio)[0]
-        candidate = base_no_ext + '.txt'
-        if os.path.exists(candidate):
-            matched_txt = candidate
-
-    # If no audio match, try fuzzy matching among .txt files directly
-    if not matched_txt and not found_audio:
-        exp1 = _norm(sanitized_title)
-        exp2 = _norm(f"{artist} - {sanitized_title}") if artist else None
-        exp3 = _norm(title)
-        exp4 = _norm(f"{artist} - {title}") if artist else None
-        artist_norm = _norm(artist) if artist else ''
-        for path in all_files:
-            if not path.lower().endswith('.txt'):
-                continue
-            base_no_ext = os.path.splitext(os.path.basename(path))[0]
-            nb = _norm(base_no_ext)
-            if nb in filter(None, (exp1, exp2, exp3, exp4)):
-                matched_txt = path
-                break
-            if exp1 and nb.startswith(exp1) and nb[len(exp1):].startswith(('feat', 'featuring', 'ft', 'with')):
-                matched_txt = path
-                break
-            if exp2 and nb.startswith(exp2) and nb[len(exp2):].startswith(('feat', 'featuring', 'ft', 'with')):
-                matched_txt = path
-                break
-            tail1 = '-' + exp1 if exp1 else None
-            tail3 = '-' + exp3 if exp3 else None
-            if tail1 and nb.endswith(tail1):
-                left = nb[: -len(tail1)]
-                if not artist_norm or left.startswith(artist_norm):
-                    matched_txt = path
-                    break
-            if tail3 and nb.endswith(tail3):
-                left = nb[: -len(tail3)]
-                if not artist_norm or left.startswith(artist_norm):
-                    matched_txt = path
-                    break
+    sanitized_title = sanitize_filename(title)
 
-    # Read lyrics from .txt or extract from audio
+    # 1) A .txt exported next to the audio: no audio file needs to be opened
     lyrics_text = None
     source = None
-    if matched_txt and os.path.exists(matched_txt):
+    found_audio = None
+    try:
+        matched_txt = _search_item_dir(base_dir, _find_lyrics_file, title, artist, sanitized_title)
+    except OSError:
+        return jsonify({'error': 'Associated content directory not found or is invalid.'}), 404
+    if matched_txt:
         try:
             with open(matched_txt, 'r', encoding='utf-8', errors='replace') as f:
                 lyrics_text = f.read()
@@ -416,10 +637,16 @@ def get_item_lyrics(item_id: int):
         except Exception:
             lyrics_text = None
             source = None
-    if lyrics_text is None and found_audio and os.path.exists(found_audio):
+
+    # 2) Otherwise locate the audio file (exact name, then fuzzy) and read its embedded lyrics
+    if lyrics_text is None:
+        try:
+            found_audio = _search_item_dir(base_dir, _find_audio_file, title, artist, sanitized_title)
+        except OSError:
+            found_audio = None
+    if lyrics_text is None and found_audio:
         try:
-            svc = LyricsService()
-            lyrics_text = svc.extract_lyrics_from_audio(found_audio)
+            lyrics_text = _lyrics_service().extract_lyrics_from_audio(found_audio)
             if lyrics_text:
                 source = 'embedded'
         except Exception:
@@ -445,9 +672,28 @@ def get_item_lyrics(item_id: int):
     }), 200
 
 
+def _x_accel_response(path: str, mimetype: str) -> Optional[Response]:
+    """Hand ``path`` to nginx when AUDIO_X_ACCEL_PREFIX is configured.
+
+    nginx then serves the bytes (ranges included) from its internal location,
+    so the worker is released immediately. Files outside BASE_OUTPUT_DIR are
+    left to send_file.
+    """
+    prefix = Config.AUDIO_X_ACCEL_PREFIX
+    if not prefix:
+        return None
+    rel = os.path.relpath(os.path.abspath(path), os.path.abspath(Config.BASE_OUTPUT_DIR))
+    if rel.startswith(os.pardir):
+        return None
+    response = Response(status=200, mimetype=mimetype)
+    response.headers['X-Accel-Redirect'] = prefix.rstrip('/') + '/' + quote(rel.replace(os.sep, '/'))
+    return response
+
+
 @download_bp.route('/items/<int:item_id>/audio', methods=['GET'])
 @login_required
-def stream_item_audio(item_id: int):
+@owned_item()
+def stream_item_audio(item_id: int, item):
     """Stream a matched audio file for a downloaded item using fuzzy matching.
 
     Query params:
@@ -459,85 +705,17 @@ def stream_item_audio(item_id: int):
     if not title:
         return jsonify({'error': 'Missing title parameter'}), 400
 
-    item = DownloadedItem.query.get(item_id)
-    if not item:
-        return jsonify({'error': 'Item not found'}), 404
     base_dir = item.local_path
-    if not base_dir or not os.path.isdir(base_dir):
+    if not base_dir:
         return jsonify({'error': 'Associated content directory not found or is invalid.'}), 404
 
-    # Gather candidate audio files only
-    audio_exts = ('.mp3', '.flac', '.m4a', '.ogg', '.wav')
-    all_audio_files = []
-    for root, _, files in os.walk(base_dir):
-        for fn in files:
-            low = fn.lower()
-            if low.endswith(audio_exts):
-                all_audio_files.append(os.path.join(root, fn))
-
-    # Normalization helper (mirrors cd_burning_service)
-    def _norm(s: str) -> str:
-        s = (s or '').lower()
-        s = s.replace('\ufffdT', "'")  # best-effort for odd apostrophes
-        s = re.sub(r"[\\/:*?\"<>|.,!()\[\]{}]", '', s)
-        s = s.replace('_', '')
-        s = re.sub(r"\s+", '', s)
-        return s
-
-    # Build expectations
-    sanitized_title = re.sub(r'[\\/:*?"<>|]', '_', title).strip()
-    sanitized_title = re.sub(r'_{2,}', '_', sanitized_title)
+    sanitized_title = sanitize_filename(title)
+    try:
+        found_audio = _search_item_dir(base_dir, _find_audio_file, title, artist, sanitized_title)
+    except OSError:
+        return jsonify({'error': 'Associated content directory not found or is invalid.'}), 404
 
-    found_audio = None
-    mp3_name = f"{sanitized_title}.mp3"
-    fallback_name = f"{artist} - {sanitized_title}.mp3" if artist else None
-    for path in all_audio_files:
-        base = os.path.basename(path)
-        if base.lower() == mp3_name.lower():
-            found_audio = path
-            break
-    if not found_audio and artist:
-        for path in all_audio_files:
-            base = os.path.basename(path)
-            if base.lower() == (fallback_name or '').lower():
-                found_audio = path
-                break
-
-    # Fuzzy-normalized across all audio files
     if not found_audio:
-        exp1 = _norm(sanitized_title)
-        exp2 = _norm(f"{artist} - {sanitized_title}") if artist else None
-        exp3 = _norm(title)
-        exp4 = _norm(f"{artist} - {title}") if artist else None
-        artist_norm = _norm(artist) if artist else ''
-        for path in all_audio_files:
-            base_no_ext = os.path.splitext(os.path.basename(path))[0]
-            nb = _norm(base_no_ext)
-            if nb in filter(None, (exp1, exp2, exp3, exp4)):
-                found_audio = path
-                break
-            # Handle trailing feat*
-            if exp1 and nb.startswith(exp1) and nb[len(exp1):].startswith(('feat', 'featuring', 'ft', 'with')):
-                found_audio = path
-                break
-            if exp2 and nb.startswith(exp2) and nb[len(exp2):].startswith(('feat', 'featuring', 'ft', 'with')):
-                found_audio = path
-                break
-            # Accept extra artists before the hyphen
-            tail1 = '-' + exp1 if exp1 else None
-            tail3 = '-' + exp3 if exp3 else None
-            if tail1 and nb.endswith(tail1):
-                left = nb[: -len(tail1)]
-                if not artist_norm or left.startswith(artist_norm):
-                    found_audio = path
-                    break
-            if tail3 and nb.endswith(tail3):
-                left = nb[: -len(tail3)]
-                if not artist_norm or left.startswith(artist_norm):
-                    found_audio = path
-                    break
-
-    if not found_audio or not os.path.exists(found_audio):
         return jsonify({'error': 'Audio file not found for this track.'}), 404
 
     # Infer MIME type from extension
@@ -547,15 +725,44 @@ def stream_item_audio(item_id: int):
         '.m4a': 'audio/mp4',
         '.flac': 'audio/flac',
         '.ogg': 'audio/ogg',
+        '.opus': 'audio/ogg',
         '.wav': 'audio/wav',
     }.get(ext, 'application/octet-stream')
 
+    accel = _x_accel_response(found_audio, mimetype)
+    if accel is not None:
+        return accel
     try:
         return send_file(found_audio, mimetype=mimetype, as_attachment=False, conditional=True)
+    except FileNotFoundError:
+        return jsonify({'error': 'Audio file not found for this track.'}), 404
     except Exception:
         logger.exception("Failed to stream audio file: %s", found_audio)
         return jsonify({'error': 'Failed to stream audio file.'}), 500
 
+# Covers only change when an item is re-downloaded; ETags catch that on revalidation
+_COVER_MAX_AGE = 86400
+# Served in this order of preference
+_COVER_FILES = (
+    ('cover.jpg', 'image/jpeg'),
+    ('cover.png', 'image/png'),
+    ('cover.svg', 'image/svg+xml'),
+)
+
+
+def _cacheable_cover(response):
+    response.cache_control.public = True
+    response.cache_control.max_age = _COVER_MAX_AGE
+    return response
+
+
+@lru_cache(maxsize=256)
+def _placeholder_svg(title: str) -> Tuple[str, str]:
+    """Render the placeholder cover for ``title``; returns ``(svg, etag)``."""
+    svg_content = render_placeholder_svg(title)
+    return svg_content, hashlib.md5(svg_content.encode('utf-8')).hexdigest()
+
+
 @download_bp.route('/items/by-spotify/<string:spotify_id>/cover', methods=['GET'])
 def get_item_cover_by_spotify(spotify_id: str):
     """Serve the cover image for an item. Falls back to a generated SVG.
@@ -567,65 +774,33 @@ def get_item_cover_by_spotify(spotify_id: str):
     if not item:
         return jsonify({'error': 'Item not found'}), 404
     base_dir = item.local_path
-    if not base_dir or not os.path.isdir(base_dir):
+    if not base_dir:
         return jsonify({'error': 'Associated content directory not found or is invalid.'}), 404
 
-    jpg = os.path.join(base_dir, 'cover.jpg')
-    png = os.path.join(base_dir, 'cover.png')
     svg = os.path.join(base_dir, 'cover.svg')
 
     try:
-        if os.path.exists(jpg):
-            return send_file(jpg, mimetype='image/jpeg', as_attachment=False, conditional=True)
-        if os.path.exists(png):
-            return send_file(png, mimetype='image/png', as_attachment=False, conditional=True)
-        if os.path.exists(svg):
-            return send_file(svg, mimetype='image/svg+xml', as_attachment=False, conditional=True)
-
-        # Generate a default SVG dynamically and return (also persist for next time)
-        title = (item.title or 'Compilation').strip()
-        # naive wrap around ~24 chars per line
-        lines = []
-        line = ''
-        for word in title.split():
-            if len(line) + len(word) + 1 <= 24:
-                line = (line + ' ' + word).strip()
-            else:
-                if line:
-                    lines.append(line)
-                line = word
-        if line:
-            lines.append(line)
-        if len(lines) > 5:
-            lines = lines[:5]
-            lines[-1] += 'â€¦'
-        dy = 0
-        if lines:
-            total = (len(lines) - 1) * 1.3
-            dy = -total / 2.0
-        text_elems = '\n'.join([
-            f"<text x='50%' y='50%' dy='{(i*1.3)+dy}em' text-anchor='middle' dominant-baseline='middle' font-family='Segoe UI, Arial, sans-serif' font-size='36' fill='#0b1727'>{line}</text>"
-            for i, line in enumerate(lines)
-        ])
-        svg_content = f"""
-<svg xmlns='http://www.w3.org/2000/svg' width='640' height='640' viewBox='0 0 640 640'>
-  <defs>
-    <linearGradient id='bg' x1='0' y1='0' x2='1' y2='1'>
-      <stop offset='0%' stop-color='#a7c5eb'/>
-      <stop offset='100%' stop-color='#74b9ff'/>
-    </linearGradient>
-  </defs>
-  <rect width='100%' height='100%' fill='url(#bg)'/>
-  {text_elems}
-</svg>
-""".strip()
+        # send_file stats each candidate itself; a missing one just moves on to the next
+        for name, mimetype in _COVER_FILES:
+            try:
+                return _cacheable_cover(send_file(
+                    os.path.join(base_dir, name), mimetype=mimetype, as_attachment=False, conditional=True, etag=True
+                ))
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+        if not os.path.isdir(base_dir):
+            return jsonify({'error': 'Associated content directory not found or is invalid.'}), 404
+
+        # Generate a default SVG and return it (also persist for next time)
+        svg_content, etag = _placeholder_svg((item.title or 'Compilation').strip())
         try:
             with open(svg, 'w', encoding='utf-8') as f:
                 f.write(svg_content)
         except Exception:
             pass
-        from flask import Response
-        return Response(svg_content, mimetype='image/svg+xml')
+        response = Response(svg_content, mimetype='image/svg+xml')
+        response.set_etag(etag)
+        return _cacheable_cover(response).make_conditional(request)
     except Exception:
         logger.exception('Failed to serve cover for %s', spotify_id)
         return jsonify({'error': 'Failed to serve cover image'}), 500
@@ -4,7 +4,9 @@ from __future__ import annotations
 
 from flask import Blueprint, jsonify, request
 from flask_login import current_user, login_required
+from sqlalchemy import delete
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import raiseload
 
 from src.database.db_manager import Favorite, db
 
@@ -12,12 +14,18 @@ from src.database.db_manager import Favorite, db
 favorite_bp = Blueprint('favorite_bp', __name__, url_prefix='/api/favorites')
 
 VALID_FAVORITE_TYPES = {'artist', 'album', 'track'}
+_ZERO_SUMMARY = dict.fromkeys(VALID_FAVORITE_TYPES, 0)
 
 
 def _serialize(favorite: Favorite) -> dict:
     return favorite.to_dict()
 
 
+def _summary(user_id: int) -> dict:
+    # Types the user has no favorites of are absent from the grouped counts
+    return {**_ZERO_SUMMARY, **Favorite.summary_for_user(user_id)}
+
+
 def _require_type_and_id(payload: dict) -> tuple[str, str] | tuple[None, None]:
     item_type = (payload.get('item_type') or '').strip().lower()
     item_id = (payload.get('item_id') or '').strip()
@@ -34,7 +42,8 @@ def list_favorites():
     per_page = max(1, min(100, per_page))
     item_type = (request.args.get('type') or '').strip().lower()
 
-    query = Favorite.query.filter_by(user_id=current_user.id)
+    # to_dict only reads columns; fail loudly if a relationship load sneaks in
+    query = Favorite.query.options(raiseload('*')).filter_by(user_id=current_user.id)
     if item_type in VALID_FAVORITE_TYPES:
         query = query.filter(Favorite.item_type == item_type)
 
@@ -65,10 +74,7 @@ def list_favorites():
 @favorite_bp.route('/summary', methods=['GET'])
 @login_required
 def favorites_summary():
-    summary = Favorite.summary_for_user(current_user.id)
-    for favorite_type in VALID_FAVORITE_TYPES:
-        summary.setdefault(favorite_type, 0)
-    return jsonify({'summary': summary}), 200
+    return jsonify({'summary': _summary(current_user.id)}), 200
 
 
 @favorite_bp.route('/status', methods=['GET'])
@@ -105,18 +111,24 @@ def toggle_favorite():
         return jsonify({'error': 'invalid_parameters'}), 400
 
     metadata = payload.get('metadata') or {}
-    favorite = Favorite.query.filter_by(
-        user_id=current_user.id,
-        item_type=item_type,
-        item_id=item_id,
-    ).first()
+    # Read before committing: the commit expires current_user and would reload it
+    user_id = current_user.id
+    # Try the unfavorite first: one DELETE both checks for and removes the row,
+    # so toggling off no longer needs a SELECT and cannot race another toggle
+    removed = db.session.execute(
+        delete(Favorite)
+        .where(
+            Favorite.user_id == user_id,
+            Favorite.item_type == item_type,
+            Favorite.item_id == item_id,
+        )
+        .execution_options(synchronize_session=False)
+    ).rowcount
 
-    if favorite:
-        db.session.delete(favorite)
+    if removed:
+        # Counted inside the same transaction as the delete
+        summary = _summary(user_id)
         db.session.commit()
-        summary = Favorite.summary_for_user(current_user.id)
-        for favorite_type in VALID_FAVORITE_TYPES:
-            summary.setdefault(favorite_type, 0)
         return (
             jsonify(
                 {
@@ -129,7 +141,7 @@ def toggle_favorite():
         )
 
     favorite = Favorite(
-        user_id=current_user.id,
+        user_id=user_id,
         item_type=item_type,
         item_id=item_id,
         item_name=(metadata.get('name') or metadata.get('title') or item_id)[:255],
@@ -140,26 +152,28 @@ def toggle_favorite():
     db.session.add(favorite)
 
     try:
+        db.session.flush()
+        # Serialize and count before the commit expires the new row
+        serialized = _serialize(favorite)
+        summary = _summary(user_id)
         db.session.commit()
     except IntegrityError:
         db.session.rollback()
         favorite = Favorite.query.filter_by(
-            user_id=current_user.id,
+            user_id=user_id,
             item_type=item_type,
             item_id=item_id,
         ).first()
         if favorite is None:
             return jsonify({'error': 'unable_to_toggle'}), 409
-
-    summary = Favorite.summary_for_user(current_user.id)
-    for favorite_type in VALID_FAVORITE_TYPES:
-        summary.setdefault(favorite_type, 0)
+        serialized = _serialize(favorite)
+        summary = _summary(user_id)
 
     return (
         jsonify(
             {
                 'favorited': True,
-                'favorite': _serialize(favorite),
+                'favorite': serialized,
                 'summary': summary,
             }
         ),
@@ -170,18 +184,18 @@ def toggle_favorite():
 @favorite_bp.route('/<int:favorite_id>', methods=['DELETE'])
 @login_required
 def remove_favorite(favorite_id: int):
+    user_id = current_user.id
     favorite = Favorite.query.filter_by(
         id=favorite_id,
-        user_id=current_user.id,
+        user_id=user_id,
     ).first()
     if favorite is None:
         return jsonify({'error': 'not_found'}), 404
 
     db.session.delete(favorite)
+    db.session.flush()
+    summary = _summary(user_id)
     db.session.commit()
-    summary = Favorite.summary_for_user(current_user.id)
-    for favorite_type in VALID_FAVORITE_TYPES:
-        summary.setdefault(favorite_type, 0)
 
     return (
         jsonify(
@@ -2,12 +2,14 @@
 
 from __future__ import annotations
 
-from typing import Iterable
+from typing import Dict, Iterable
 
 from flask import Blueprint, jsonify, request
 from flask_login import current_user, login_required
+from sqlalchemy import delete, update
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm import raiseload, selectinload
 
 from src.database.db_manager import (
     db,
@@ -29,13 +31,32 @@ def _owned_playlist(playlist_id: int) -> Playlist | None:
         return None
     return (
         Playlist.query.options(
-            selectinload(Playlist.entries).selectinload(PlaylistTrack.track)
+            selectinload(Playlist.entries).selectinload(PlaylistTrack.track),
+            raiseload('*'),
         )
         .filter_by(id=playlist_id, user_id=current_user.id)
         .first()
     )
 
 
+def _clear_entries(playlist: Playlist) -> None:
+    """Delete all of the playlist's entries with one statement.
+
+    Clearing the collection through the ORM emits a DELETE per entry. The
+    removed rows are expunged and the collection is marked empty without
+    recording history, so the next flush has nothing left to do for them.
+    """
+    db.session.execute(
+        delete(PlaylistTrack)
+        .where(PlaylistTrack.playlist_id == playlist.id)
+        .execution_options(synchronize_session=False)
+    )
+    for entry in playlist.entries:
+        if entry in db.session:
+            db.session.expunge(entry)
+    set_committed_value(playlist, 'entries', [])
+
+
 def _normalize_artists(value) -> list[str]:
     if not value:
         return []
@@ -44,8 +65,21 @@ def _normalize_artists(value) -> list[str]:
     return [piece.strip() for piece in str(value).split(',') if piece.strip()]
 
 
-def _ensure_track(track_payload: dict, user_id: int) -> DownloadedTrack:
-    spotify_id = (track_payload.get('spotify_id') or track_payload.get('id') or '').strip()
+def _payload_spotify_id(track_payload: dict) -> str:
+    return (track_payload.get('spotify_id') or track_payload.get('id') or '').strip()
+
+
+def _ensure_track(
+    track_payload: dict,
+    user_id: int,
+    known: Dict[str, DownloadedTrack],
+) -> DownloadedTrack:
+    """Return the user's track for ``track_payload``, creating it if needed.
+
+    ``known`` maps spotify ids to the tracks already loaded or created in this
+    request, so the database is not queried per track.
+    """
+    spotify_id = _payload_spotify_id(track_payload)
     if not spotify_id:
         raise ValueError('Track spotify_id is required')
 
@@ -59,10 +93,7 @@ def _ensure_track(track_payload: dict, user_id: int) -> DownloadedTrack:
         or track_payload.get('artist')
     )
 
-    track = DownloadedTrack.query.filter_by(
-        spotify_id=spotify_id,
-        user_id=user_id,
-    ).first()
+    track = known.get(spotify_id)
 
     if track is None:
         track = DownloadedTrack(
@@ -91,6 +122,7 @@ def _ensure_track(track_payload: dict, user_id: int) -> DownloadedTrack:
             user_id=user_id,
         )
         db.session.add(track)
+        known[spotify_id] = track
     else:
         if artists and track.artists != artists:
             track.artists = artists
@@ -105,25 +137,53 @@ def _ensure_track(track_payload: dict, user_id: int) -> DownloadedTrack:
 
 
 def _apply_tracks(playlist: Playlist, tracks: Iterable[dict]) -> None:
+    tracks = list(tracks)
     existing_spotify_ids = {
         (entry.track.spotify_id if entry.track else None)
         for entry in playlist.entries
     }
     next_position = max((entry.position for entry in playlist.entries), default=-1) + 1
-    for offset, payload in enumerate(tracks):
-        track = _ensure_track(payload, playlist.user_id)
-        if track.spotify_id in existing_spotify_ids:
+
+    spotify_ids = [_payload_spotify_id(payload) for payload in tracks]
+    # Tracks already on the playlist are skipped outright, so only the rest are
+    # fetched, with one IN query instead of one query per track
+    wanted = set(spotify_ids) - existing_spotify_ids - {''}
+    known: Dict[str, DownloadedTrack] = {}
+    if wanted:
+        known = {
+            track.spotify_id: track
+            for track in DownloadedTrack.query.filter(
+                DownloadedTrack.user_id == playlist.user_id,
+                DownloadedTrack.spotify_id.in_(wanted),
+            )
+        }
+
+    added: list[tuple[int, DownloadedTrack]] = []
+    for offset, (payload, spotify_id) in enumerate(zip(tracks, spotify_ids)):
+        if spotify_id and spotify_id in existing_spotify_ids:
             continue
-        snapshot = track.to_dict()
-        snapshot['id'] = track.id
-        entry = PlaylistTrack(
-            playlist=playlist,
-            track=track,
-            position=next_position + offset,
-            track_snapshot=snapshot,
-        )
-        db.session.add(entry)
+        track = _ensure_track(payload, playlist.user_id, known)
+        added.append((offset, track))
         existing_spotify_ids.add(track.spotify_id)
+    if not added:
+        return
+
+    # A single flush inserts the new tracks as one batch and assigns their ids
+    # for the snapshots; the entries then go out as one batch on commit.
+    db.session.flush()
+    entries = []
+    for offset, track in added:
+        # Built once here and served as-is by PlaylistTrack.to_dict from now on;
+        # the flush above already gave the track its id
+        entries.append(
+            PlaylistTrack(
+                playlist=playlist,
+                track=track,
+                position=next_position + offset,
+                track_snapshot=track.to_dict(),
+            )
+        )
+    db.session.add_all(entries)
 
 
 @playlist_bp.route('', methods=['GET'])
@@ -133,7 +193,16 @@ def list_playlists():
     per_page = request.args.get('per_page', type=int) or 10
     per_page = max(1, min(per_page, 50))
 
-    query = Playlist.query.filter_by(user_id=current_user.id).order_by(Playlist.updated_at.desc())
+    # The listing only needs each playlist's entry count: load the entries with a
+    # separate IN query instead of the default join, and skip their snapshots
+    query = (
+        Playlist.query.options(
+            selectinload(Playlist.entries).load_only(PlaylistTrack.id, PlaylistTrack.playlist_id),
+            raiseload('*'),
+        )
+        .filter_by(user_id=current_user.id)
+        .order_by(Playlist.updated_at.desc())
+    )
     pagination = query.paginate(page=page, per_page=per_page, error_out=False)
 
     return (
@@ -211,8 +280,7 @@ def update_playlist(playlist_id: int):
 
     if 'tracks' in payload:
         # Replace all tracks when explicit list provided
-        playlist.entries.clear()
-        db.session.flush()
+        _clear_entries(playlist)
         try:
             _apply_tracks(playlist, payload.get('tracks') or [])
         except ValueError as exc:
@@ -233,6 +301,7 @@ def delete_playlist(playlist_id: int):
     if playlist is None:
         return jsonify({'error': 'not_found'}), 404
 
+    _clear_entries(playlist)
     db.session.delete(playlist)
     db.session.commit()
     return jsonify({'status': 'deleted'}), 200
@@ -272,14 +341,24 @@ def remove_track(playlist_id: int, entry_id: int):
     if playlist is None:
         return jsonify({'error': 'not_found'}), 404
 
-    entry = next((item for item in playlist.entries if item.id == entry_id), None)
+    entry_map = {item.id: item for item in playlist.entries}
+    entry = entry_map.get(entry_id)
     if entry is None:
         return jsonify({'error': 'track_not_found'}), 404
 
+    removed_position = entry.position
     db.session.delete(entry)
-    remaining = [e for e in playlist.entries if e.id != entry_id]
-    for index, item in enumerate(remaining):
-        item.position = index
+    # Close the gap with one UPDATE instead of rewriting every entry's position;
+    # the commit expires the loaded entries, so the response reads the new order
+    db.session.execute(
+        update(PlaylistTrack)
+        .where(
+            PlaylistTrack.playlist_id == playlist.id,
+            PlaylistTrack.position > removed_position,
+        )
+        .values(position=PlaylistTrack.position - 1)
+        .execution_options(synchronize_session=False)
+    )
     db.session.commit()
     return jsonify({'playlist': _serialize_playlist(playlist)}), 200
 
@@ -301,15 +380,22 @@ def reorder_tracks(playlist_id: int):
     if missing_ids:
         return jsonify({'error': 'unknown_entries', 'entries': missing_ids}), 400
 
-    for position, entry_id in enumerate(order):
-        entry_map[entry_id].position = position
+    mappings = [{'id': entry_id, 'position': position} for position, entry_id in enumerate(order)]
 
     # Keep unspecified entries at the end preserving order
-    unspecified = [entry for entry in playlist.entries if entry.id not in order]
-    base = len(order)
-    for offset, entry in enumerate(sorted(unspecified, key=lambda e: e.position)):
-        entry.position = base + offset
+    listed = set(order)
+    unspecified = sorted(
+        (entry for entry in playlist.entries if entry.id not in listed),
+        key=lambda e: e.position,
+    )
+    mappings.extend(
+        {'id': entry.id, 'position': position}
+        for position, entry in enumerate(unspecified, start=len(order))
+    )
 
+    # Bulk UPDATE by primary key: one executemany rather than a flush that
+    # diffs and updates every entry object; the commit expires the stale ones
+    db.session.execute(update(PlaylistTrack), mappings)
     db.session.commit()
     return jsonify({'playlist': _serialize_playlist(playlist)}), 200
 
@@ -3,6 +3,7 @@ from flask import Blueprint, Response
 from flask_cors import cross_origin
 
 from config import Config
+from src.interfaces.http.responses import SSE_HEADERS
 
 logger = logging.getLogger(__name__)
 
@@ -28,11 +29,5 @@ def stream_progress():
         except GeneratorExit:
             logger.info('SSE client disconnected')
 
-    headers = {
-        'Content-Type': 'text/event-stream',
-        'Cache-Control': 'no-cache, no-transform',
-        'Connection': 'keep-alive',
-        'X-Accel-Buffering': 'no',
-    }
-    return Response(_gen(), headers=headers)
+    return Response(_gen(), headers=SSE_HEADERS)
 
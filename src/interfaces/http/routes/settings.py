@@ -50,15 +50,17 @@ class ApiKeysPayload(BaseModel):
     spotify_client_secret: str | None = Field(default=None, max_length=256)
     genius_access_token: str | None = Field(default=None, max_length=512)
 
-    @field_validator("spotify_client_id", "spotify_client_secret", "genius_access_token", mode="before")
+    @model_validator(mode="before")
     @classmethod
-    def _normalize(cls, value: Any) -> Any:
-        if value is None:
-            return None
-        if isinstance(value, str):
-            stripped = value.strip()
-            return stripped if stripped else ""
-        return str(value).strip()
+    def _normalize(cls, data: Any) -> Any:
+        # One pass over the submitted keys; absent keys stay absent for exclude_unset
+        if not isinstance(data, dict):
+            return data
+        return {key: value if value is None else str(value).strip() for key, value in data.items()}
+
+
+# Keys of a flat (legacy) payload that belong to the download section
+_DOWNLOAD_FIELDS = frozenset(DownloadSettingsPayload.model_fields)
 
 
 class SettingsUpdatePayload(BaseModel):
@@ -72,10 +74,7 @@ class SettingsUpdatePayload(BaseModel):
             return data
         if "download" in data:
             return data
-        download_fields = {}
-        for key in ("base_output_dir", "threads", "preload", "simple_tui"):
-            if key in data:
-                download_fields[key] = data[key]
+        download_fields = {key: data[key] for key in data.keys() & _DOWNLOAD_FIELDS}
         result: Dict[str, Any] = {"download": download_fields}
         if "api_keys" in data:
             result["api_keys"] = data["api_keys"]
@@ -143,7 +142,6 @@ def update_download_settings():
 
     defaults = get_default_download_settings()
     api_keys = describe_user_api_keys(current_user)
-    spotify_ready = user_has_spotify_credentials(keys)
     genius_ready = user_has_genius_credentials(keys)
     spotdl_ready = bool(current_app.extensions.get("spotdl_ready", False) and spotify_ready)
     return (
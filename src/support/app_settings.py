@@ -66,13 +66,18 @@ def _coerce_bool(value: Any) -> bool:
     return bool(value)
 
 
+# Captured at import, before apply_download_settings overwrites the Config
+# attributes with runtime values, so these stay the configured defaults
+_DEFAULT_DOWNLOAD_SETTINGS: Dict[str, Any] = {
+    "base_output_dir": Config.BASE_OUTPUT_DIR,
+    "threads": max(1, int(getattr(Config, "SPOTDL_THREADS", 1) or 1)),
+    "preload": bool(getattr(Config, "SPOTDL_PRELOAD", False)),
+    "simple_tui": bool(getattr(Config, "SPOTDL_SIMPLE_TUI", True)),
+}
+
+
 def get_default_download_settings() -> Dict[str, Any]:
-    return {
-        "base_output_dir": Config.BASE_OUTPUT_DIR,
-        "threads": max(1, int(getattr(Config, "SPOTDL_THREADS", 1) or 1)),
-        "preload": bool(getattr(Config, "SPOTDL_PRELOAD", False)),
-        "simple_tui": bool(getattr(Config, "SPOTDL_SIMPLE_TUI", True)),
-    }
+    return dict(_DEFAULT_DOWNLOAD_SETTINGS)
 
 
 def _normalize_download_settings(raw: Optional[Dict[str, Any]]) -> Dict[str, Any]:
@@ -254,8 +259,7 @@ def apply_api_keys(
             try:
                 if spotify_client_id and spotify_client_secret:
                     try:
-                        import spotipy  # type: ignore
-                        from spotipy.oauth2 import SpotifyClientCredentials  # type: ignore
+                        from src.infrastructure.spotify import get_spotify_client
                     except Exception as exc:  # pragma: no cover - defensive import
                         orchestrator.sp = None
                         if target_app.logger:
@@ -266,12 +270,7 @@ def apply_api_keys(
                             )
                     else:
                         try:
-                            orchestrator.sp = spotipy.Spotify(
-                                auth_manager=SpotifyClientCredentials(
-                                    client_id=spotify_client_id,
-                                    client_secret=spotify_client_secret,
-                                )
-                            )
+                            orchestrator.sp = get_spotify_client(spotify_client_id, spotify_client_secret)
                         except Exception as exc:
                             orchestrator.sp = None
                             if target_app.logger:
@@ -287,7 +286,11 @@ def apply_api_keys(
                 from src.domain.catalog.lyrics_service import LyricsService
 
                 orchestrator._genius_access_token = genius_access_token
-                orchestrator.lyrics_service = LyricsService(genius_access_token=genius_access_token)
+                # Keep the lyrics memo across the rebuild
+                orchestrator.lyrics_service = LyricsService(
+                    genius_access_token=genius_access_token,
+                    remote_cache=getattr(orchestrator.lyrics_service, "remote_cache", None),
+                )
             except Exception:
                 if target_app.logger:
                     target_app.logger.debug(
@@ -5,7 +5,7 @@ from __future__ import annotations
 import time
 from collections import OrderedDict
 from threading import RLock
-from typing import Any, Hashable, Tuple
+from typing import Any, Dict, Hashable, Optional, Tuple
 
 MISSING = object()
 
@@ -42,9 +42,9 @@ class TTLCache:
             self._data.move_to_end(key)
             return value
 
-    def set(self, key: Hashable, value: Any) -> None:
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
         with self._lock:
-            expiry = time.time() + self.ttl
+            expiry = time.time() + (self.ttl if ttl is None else ttl)
             if key in self._data:
                 self._data.move_to_end(key)
             self._data[key] = (value, expiry)
@@ -61,4 +61,48 @@ class TTLCache:
             return key in self._data
 
 
-__all__ = ["TTLCache", "MISSING"]
+class AdaptiveTTL:
+    """Per-kind TTL that follows how often refetched entries actually changed.
+
+    Each refetch of a previously seen entry records whether the payload
+    differed. An exponentially weighted change rate ``r`` per kind scales the
+    base TTL by ``(1 - r) / max(r, 0.1)``: kinds that never change drift up to
+    10x the base, kinds that always change fall to ``min_ttl``.
+    """
+
+    def __init__(
+        self,
+        base_ttl: float,
+        *,
+        min_ttl: float = 60.0,
+        max_ttl: float = 30 * 24 * 3600.0,
+        alpha: float = 0.2,
+    ) -> None:
+        if base_ttl <= 0:
+            raise ValueError("base_ttl must be positive")
+        self.base_ttl = base_ttl
+        self.min_ttl = min(min_ttl, base_ttl)
+        self.max_ttl = max(max_ttl, base_ttl)
+        self.alpha = alpha
+        self._rates: Dict[Hashable, float] = {}
+        self._lock = RLock()
+
+    def record(self, kind: Hashable, changed: bool) -> None:
+        sample = 1.0 if changed else 0.0
+        with self._lock:
+            previous = self._rates.get(kind)
+            if previous is None:
+                self._rates[kind] = sample
+            else:
+                self._rates[kind] = previous + self.alpha * (sample - previous)
+
+    def ttl_for(self, kind: Hashable) -> float:
+        with self._lock:
+            rate = self._rates.get(kind)
+        if rate is None:
+            return self.base_ttl
+        ttl = self.base_ttl * (1.0 - rate) / max(rate, 0.1)
+        return max(self.min_ttl, min(self.max_ttl, ttl))
+
+
+__all__ = ["TTLCache", "AdaptiveTTL", "MISSING"]
@@ -0,0 +1,20 @@
+"""Filename sanitisation shared by the download and lyrics helpers."""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+
+# Characters that are invalid in Windows/POSIX file names, mapped to '_'
+_INVALID_FILENAME_CHARS = str.maketrans({c: '_' for c in '\\/:*?"<>|'})
+_MULTI_UNDERSCORE_RE = re.compile(r'_{2,}')
+
+
+# Artist, album and compilation names repeat across tracks and requests
+@lru_cache(maxsize=1024)
+def sanitize_filename(name: str) -> str:
+    """Return ``name`` made safe for use as a file or directory name."""
+    return _MULTI_UNDERSCORE_RE.sub('_', name.translate(_INVALID_FILENAME_CHARS).strip())
+
+
+__all__ = ["sanitize_filename"]
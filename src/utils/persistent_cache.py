@@ -0,0 +1,118 @@
+"""SQLite-backed metadata cache shared across restarts and worker processes."""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+import time
+from threading import RLock
+from typing import Any, Hashable, Optional, Tuple
+
+from .cache import MISSING
+
+try:  # optional: faster encoding when available
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+
+def _dumps(value: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, ensure_ascii=False).encode("utf-8")
+
+
+def _loads(blob: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(blob)
+    return json.loads(blob)
+
+
+class SQLiteCache:
+    """Persistent key/value cache with per-entry TTL.
+
+    Values must be JSON-serialisable. Keys are hashed through ``repr`` so the
+    tuple keys used by the in-memory caches work unchanged. WAL mode lets
+    several processes read while one writes.
+    """
+
+    def __init__(self, path: str, ttl: float = 300.0) -> None:
+        if ttl <= 0:
+            raise ValueError("ttl must be positive")
+        self.path = path
+        self.ttl = ttl
+        self._lock = RLock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, isolation_level=None, check_same_thread=False, timeout=5)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, blob BLOB NOT NULL, ts REAL NOT NULL, ttl REAL NOT NULL)"
+        )
+
+    @staticmethod
+    def _key(key: Hashable) -> str:
+        return repr(key)
+
+    def get_with_expiry(self, key: Hashable) -> Tuple[Any, Optional[float]]:
+        """Return ``(value, seconds_left)`` or ``(MISSING, None)``."""
+        with self._lock:
+            try:
+                row = self._db.execute(
+                    "SELECT blob, ts, ttl FROM meta WHERE key = ?", (self._key(key),)
+                ).fetchone()
+            except sqlite3.Error as exc:
+                logger.debug("Persistent cache read failed: %s", exc)
+                return MISSING, None
+        if row is None:
+            return MISSING, None
+        blob, ts, ttl = row
+        remaining = ts + ttl - time.time()
+        if remaining <= 0:
+            return MISSING, None
+        try:
+            return _loads(blob), remaining
+        except Exception:
+            return MISSING, None
+
+    def get(self, key: Hashable, default: Any = MISSING) -> Any:
+        value, _ = self.get_with_expiry(key)
+        return default if value is MISSING else value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        try:
+            blob = _dumps(value)
+        except Exception as exc:
+            logger.debug("Skipping persistent cache write for %r: %s", key, exc)
+            return
+        with self._lock:
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO meta (key, blob, ts, ttl) VALUES (?, ?, ?, ?)",
+                    (self._key(key), blob, time.time(), self.ttl if ttl is None else ttl),
+                )
+            except sqlite3.Error as exc:
+                logger.debug("Persistent cache write failed: %s", exc)
+
+    def purge_expired(self) -> None:
+        with self._lock:
+            try:
+                self._db.execute("DELETE FROM meta WHERE ts + ttl <= ?", (time.time(),))
+            except sqlite3.Error as exc:
+                logger.debug("Persistent cache purge failed: %s", exc)
+
+    def clear(self) -> None:
+        with self._lock:
+            try:
+                self._db.execute("DELETE FROM meta")
+            except sqlite3.Error as exc:
+                logger.debug("Persistent cache clear failed: %s", exc)
+
+
+__all__ = ["SQLiteCache"]
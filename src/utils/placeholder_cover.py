@@ -0,0 +1,50 @@
+"""Generated SVG cover used when an item has no cover image."""
+
+from __future__ import annotations
+
+import textwrap
+from typing import List
+from xml.sax.saxutils import escape
+
+_SVG_TEMPLATE = """<svg xmlns='http://www.w3.org/2000/svg' width='640' height='640' viewBox='0 0 640 640'>
+  <defs>
+    <linearGradient id='bg' x1='0' y1='0' x2='1' y2='1'>
+      <stop offset='0%%' stop-color='#a7c5eb'/>
+      <stop offset='100%%' stop-color='#74b9ff'/>
+    </linearGradient>
+  </defs>
+  <rect width='100%%' height='100%%' fill='url(#bg)'/>
+  %s
+</svg>"""
+_SVG_TEXT_LINE = (
+    "<text x='50%%' y='50%%' dy='%sem' text-anchor='middle' dominant-baseline='middle' "
+    "font-family='Segoe UI, Arial, sans-serif' font-size='36' fill='#0b1727'>%s</text>"
+)
+_LINE_HEIGHT_EM = 1.3
+
+
+def _wrap_title(title: str, width: int = 24, max_lines: int = 5) -> List[str]:
+    """Greedy word wrap at ``width`` characters, capped at ``max_lines``."""
+    # Words are kept whole; overflow ends the last line with an ellipsis
+    return textwrap.wrap(
+        title,
+        width=width,
+        max_lines=max_lines,
+        placeholder='…',
+        break_long_words=False,
+        break_on_hyphens=False,
+    )
+
+
+def render_placeholder_svg(title: str) -> str:
+    """Return a gradient SVG cover with ``title`` wrapped and centred."""
+    lines = _wrap_title(title)
+    # vertical offset so the group of lines is centred
+    dy = -((len(lines) - 1) * _LINE_HEIGHT_EM) / 2.0 if lines else 0
+    text_elems = '\n'.join(
+        _SVG_TEXT_LINE % ((i * _LINE_HEIGHT_EM) + dy, escape(line)) for i, line in enumerate(lines)
+    )
+    return _SVG_TEMPLATE % text_elems
+
+
+__all__ = ["render_placeholder_svg"]
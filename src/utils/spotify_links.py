@@ -0,0 +1,51 @@
+"""Parsing helpers for Spotify web links and URIs."""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Tuple
+from urllib.parse import urlsplit
+
+# Checked in this order when the kind is only present as a substring
+ITEM_TYPES = ("playlist", "album", "track")
+
+# Canonical web links and URIs: .../album/<id> or spotify:album:<id>
+_SPOTIFY_LINK_RE = re.compile(r"[/:](playlist|album|track)[/:]([A-Za-z0-9]{22})(?![A-Za-z0-9])", re.IGNORECASE)
+
+
+@lru_cache(maxsize=1024)
+def parse_spotify_link(link: str) -> Tuple[str, str]:
+    """Return ``(item_type, spotify_id)`` for a Spotify link.
+
+    ``item_type`` is one of ``ITEM_TYPES`` or ``"unknown"``. The id is the
+    last path segment with any query string or trailing slash removed, which
+    also covers localized paths such as ``/intl-it/album/<id>``.
+    """
+    if not link:
+        return "unknown", ""
+    match = _SPOTIFY_LINK_RE.search(link)
+    if match is not None:
+        return match.group(1).lower(), match.group(2)
+
+    if link.startswith("spotify:"):
+        location = link
+        segments = [segment for segment in link.split(":")[1:] if segment]
+    else:
+        location = urlsplit(link).path
+        segments = [segment for segment in location.split("/") if segment]
+    spotify_id = segments[-1] if segments else ""
+
+    lowered = [segment.lower() for segment in segments[:-1]]
+    for item_type in ITEM_TYPES:
+        if item_type in lowered:
+            return item_type, spotify_id
+    # Only the path counts: query strings like ``?context=track`` must not match
+    location_lower = location.lower()
+    for item_type in ITEM_TYPES:
+        if item_type in location_lower:
+            return item_type, spotify_id
+    return "unknown", spotify_id
+
+
+__all__ = ["ITEM_TYPES", "parse_spotify_link"]